@@ -0,0 +1,29 @@
+"""AiCore MRDC data extraction, cleaning and upload utilities.
+
+The classes below are resolved lazily on first access, so
+``import mrdc`` performs no work and pulls in none of the
+extraction stack (tabula, boto3, requests, sqlalchemy).
+"""
+
+import importlib
+
+_LAZY_ATTRS = {
+    "AsyncDataExtractor": "mrdc.async_extraction",
+    "ColumnarExport": "mrdc.columnar_export",
+    "DataCleaning": "mrdc.data_cleaning",
+    "DataExtractor": "mrdc.data_extraction",
+    "DataQuality": "mrdc.data_quality",
+    "DatabaseConnector": "mrdc.database_utils",
+    "KeyIntegrity": "mrdc.key_integrity",
+    "Pipeline": "mrdc.pipeline",
+    "QueryCache": "mrdc.query_cache",
+    "TableVersions": "mrdc.query_cache",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
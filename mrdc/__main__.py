@@ -0,0 +1,45 @@
+"""Command line entry point: ``python -m mrdc [stage ...]``."""
+
+import argparse
+
+
+def main(argv=None):
+    from .pipeline import Pipeline
+
+    parser = argparse.ArgumentParser(
+        prog="python -m mrdc",
+        description="Pull, clean and upload the MRDC datasets to the local DB, "
+                    "then apply the constraints and run the analytics queries.")
+    parser.add_argument("stages", nargs="*", metavar="stage",
+                        help=f"stages to run, from {', '.join(Pipeline.STAGES)} (default: all)")
+    parser.add_argument("--creds", default="db_credentials.yaml",
+                        help="path to the .yaml credentials file (default: %(default)s)")
+    parser.add_argument("--export-dir", default="star_schema_export",
+                        help="directory the export stage writes Parquet files to (default: %(default)s)")
+    parser.add_argument("--offline", action="store_true",
+                        help="run the analytics stage with DuckDB against the Parquet export "
+                             "instead of the local database")
+    parser.add_argument("--async-extract", action="store_true",
+                        help="extract all sources concurrently before the stages run")
+    parser.add_argument("--max-concurrency", type=int, default=20,
+                        help="maximum requests in flight with --async-extract (default: %(default)s)")
+    parser.add_argument("--requests-per-second", type=float, default=None,
+                        help="global request rate limit with --async-extract (default: unlimited)")
+    parser.add_argument("--cache-dir", default=".mrdc_cache",
+                        help="directory for table versions and cached analytics results (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-execute the analytics queries")
+    args = parser.parse_args(argv)
+
+    unknown = [stage for stage in args.stages if stage not in Pipeline.STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    Pipeline(creds_filepath=args.creds, export_dir=args.export_dir, offline=args.offline,
+             async_extract=args.async_extract, max_concurrency=args.max_concurrency,
+             requests_per_second=args.requests_per_second, cache_dir=args.cache_dir,
+             use_cache=not args.no_cache).run(args.stages)
+
+
+if __name__ == "__main__":
+    main()
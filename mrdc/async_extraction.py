@@ -0,0 +1,162 @@
+import asyncio
+import contextlib
+import io
+
+import pandas as pd
+
+
+class AsyncDataExtractor():
+    """Asynchronous counterpart of DataExtractor. Every source is a
+    coroutine, so that extractions from the store API, S3, the PDF
+    file and the RDS instance can run concurrently on one event loop.
+
+    Must be used as an async context manager, which opens a single
+    aiohttp session (and connection pool) shared by all HTTP pulls.
+    A boto3 S3 client with a matching connection pool is created on
+    first use and closed with the session. Blocking libraries (boto3,
+    tabula, sqlalchemy) are run in worker threads. Every request, of
+    any source, first acquires a slot from a shared budget of
+    max_concurrency requests in flight and, if requests_per_second is
+    given, waits for its turn under that global rate.
+
+    HTTP requests answered with a 5xx response code are retried up
+    to max_retries times, waiting backoff * 2**attempt seconds (outside
+    the budget) between attempts. request_retries counts the retries
+    made and request_errors the requests that still failed.
+
+    All endpoints, URIs and engines are passed in by the caller, so
+    the extractor can be pointed at local stand-ins: a stub HTTP
+    server, a moto S3 server (via s3_endpoint_url) and a local
+    Postgres or SQLite sqlalchemy engine.
+    """
+
+    def __init__(self, max_concurrency=20, requests_per_second=None, s3_endpoint_url=None,
+                 max_retries=3, backoff=0.5):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.s3_endpoint_url = s3_endpoint_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.request_retries = 0
+        self.request_errors = 0
+        self.session = None
+        self.s3_client = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.__rate_lock = asyncio.Lock()
+        self.__next_slot = 0.0
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency))
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+        if self.s3_client is not None:
+            self.s3_client.close()
+            self.s3_client = None
+
+    @contextlib.asynccontextmanager
+    async def __budget(self):
+        """Holds one slot of the concurrency budget for the
+        duration of a request, after waiting for the next free
+        slot under the rate limit (if any)."""
+        async with self.__semaphore:
+            if self.requests_per_second:
+                async with self.__rate_lock:
+                    now = asyncio.get_running_loop().time()
+                    wait = self.__next_slot - now
+                    self.__next_slot = max(now, self.__next_slot) + 1 / self.requests_per_second
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
+
+    async def __get_json(self, endpoint, header_dict=None):
+        """Sends a HTTP GET request to endpoint, retrying while the
+        response code is 5xx. Returns the decoded JSON body if
+        successful response code (200), otherwise the failure code
+        is printed and None returned."""
+        for attempt in range(self.max_retries + 1):
+            async with self.__budget():
+                async with self.session.get(endpoint, headers=header_dict) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    if response.status < 500 or attempt == self.max_retries:
+                        self.request_errors += 1
+                        print(f"Error: {response.status} - {await response.text()}")
+                        return None
+            self.request_retries += 1
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def extract_json(self, endpoint):
+        """Pulls a JSON document from endpoint and returns it as a
+        pandas dataframe, or None on failure."""
+        data = await self.__get_json(endpoint)
+        if data is not None:
+            return pd.DataFrame(data)
+
+    async def list_number_of_stores(self, endpoint, header_dict):
+        """Returns the 'number_stores' field from endpoint, or
+        None on failure."""
+        data = await self.__get_json(endpoint, header_dict)
+        if data is not None:
+            return data['number_stores']
+
+    async def retrieve_stores_data(self, num_stores, endpoint, header_dict):
+        """Requests the data of stores 0 to num_stores concurrently
+        (within the shared budget) and returns the successful
+        responses as a pandas dataframe, in store number order."""
+        if num_stores is None:
+            raise ValueError("Number of stores is unknown, the number of stores request failed.")
+
+        stores_list = await asyncio.gather(*[
+            self.__get_json(endpoint + str(i), header_dict) for i in range(0, num_stores+1)
+        ])
+
+        return pd.DataFrame([store for store in stores_list if store is not None])
+
+    async def extract_from_s3(self, uri):
+        """Takes an AWS S3 bucket URI, downloads the CSV object in
+        a worker thread and returns it as a pandas dataframe."""
+        import boto3
+        from botocore.config import Config
+
+        uri = uri[5:] # Removes the 's3://' prefix
+        bucket_name, obj_key = uri.split('/', 1) # strip
+
+        if self.s3_client is None:
+            self.s3_client = boto3.client(
+                's3', endpoint_url=self.s3_endpoint_url,
+                config=Config(max_pool_connections=self.max_concurrency))
+
+        def get_object():
+            file = self.s3_client.get_object(Bucket=bucket_name, Key=obj_key)
+            return file['Body'].read()
+
+        async with self.__budget():
+            file = await asyncio.to_thread(get_object)
+
+        return pd.read_csv(io.BytesIO(file))
+
+    async def retrieve_pdf_data(self, url):
+        """Reads every page of the PDF file at url with tabula in
+        a worker thread and returns the pages concatenated as a
+        pandas dataframe."""
+        import tabula
+
+        async with self.__budget():
+            dataframes = await asyncio.to_thread(tabula.read_pdf, url, pages="all")
+
+        return pd.concat(dataframes, ignore_index=True, axis=0)
+
+    async def read_rds_table(self, engine, target_table):
+        """Reads target_table through the given sqlalchemy engine in
+        a worker thread, using the engine's connection pool. Returns
+        a pandas dataframe. Any exception raised by the read is
+        propagated to the caller."""
+        async with self.__budget():
+            return await asyncio.to_thread(pd.read_sql_table, target_table, con=engine)
@@ -0,0 +1,162 @@
+import os
+import re
+import shutil
+import uuid
+
+import pandas as pd
+
+
+DIM_TABLES = ["dim_users", "dim_store_details", "dim_products",
+              "dim_date_times", "dim_card_details"]
+ORDERS_TABLE = "orders_table"
+ORDERS_PARTITION_COLS = ["year", "month"]
+
+# Postgres SQL used in analytics.sql whose DuckDB equivalent is
+# spelled differently, matched case-insensitively.
+DUCKDB_TRANSLATIONS = {
+    "json_build_object(": "json_object(",
+    # numeric is DECIMAL(18,3) in DuckDB, which rounds before ROUND(x, 2)
+    "::numeric": "::DECIMAL(38,10)",
+    # DuckDB returns whole seconds and milliseconds, Postgres keeps the microseconds
+    "EXTRACT(SECOND FROM": "0.000001 * EXTRACT(MICROSECOND FROM",
+    "EXTRACT(MILLISECOND FROM": "0.001 * EXTRACT(MICROSECOND FROM",
+}
+_DUCKDB_TRANSLATION_REGEX = re.compile("|".join(re.escape(pg_sql) for pg_sql in DUCKDB_TRANSLATIONS),
+                                       re.IGNORECASE)
+_DUCKDB_TRANSLATIONS_LOWER = {pg_sql.lower(): duckdb_sql for pg_sql, duckdb_sql in DUCKDB_TRANSLATIONS.items()}
+
+
+class ColumnarExport():
+    """Class to export the star schema from the local database to
+    Parquet files, and to run the analytics queries against those
+    files with an embedded DuckDB database, without a Postgres
+    server.
+
+    Every dimension table is written to <export_dir>/<table>.parquet.
+    orders_table is written to <export_dir>/orders_table/ as a hive
+    partitioned dataset, partitioned by the year and month of each
+    order's entry in dim_date_times. pyarrow and duckdb are imported
+    by the methods that use them.
+
+    Before execution, the Postgres SQL in DUCKDB_TRANSLATIONS is
+    rewritten to its DuckDB equivalent, so that the reports match
+    their Postgres results (checked against duckdb 1.5).
+    """
+
+    def __init__(self, export_dir):
+        self.export_dir = export_dir
+
+    def __table_path(self, table_name):
+        if table_name == ORDERS_TABLE:
+            return os.path.join(self.export_dir, ORDERS_TABLE)
+        return os.path.join(self.export_dir, f"{table_name}.parquet")
+
+    def __parquet_safe(self, df):
+        """Helper method, casts columns holding uuid.UUID objects
+        (as read from Postgres UUID columns) to str, which Parquet
+        can store. Return: converted dataframe."""
+        for col in df.columns[df.dtypes == object]:
+            non_null = df[col].dropna()
+            if len(non_null) and isinstance(non_null.iloc[0], uuid.UUID):
+                df[col] = df[col].astype(str).where(df[col].notna())
+
+        return df
+
+    def file_versions(self):
+        """Returns a version stamp for every exported table, built
+        from the path, modification time and size of its Parquet
+        file, or of every file in its partition directory. Any
+        rewrite or replacement of the files changes the stamp.
+        Tables that have not been exported have the version None."""
+        versions = {}
+        for table_name in DIM_TABLES + [ORDERS_TABLE]:
+            path = self.__table_path(table_name)
+            if os.path.isdir(path):
+                file_paths = sorted(os.path.join(root, name) for root, _, names in os.walk(path)
+                                    for name in names)
+            elif os.path.exists(path):
+                file_paths = [path]
+            else:
+                versions[table_name] = None
+                continue
+            stats = [(os.path.relpath(file_path, path), os.stat(file_path)) for file_path in file_paths]
+            versions[table_name] = ";".join(f"{name}:{stat.st_mtime_ns}:{stat.st_size}" for name, stat in stats)
+
+        return versions
+
+    def export_star_schema(self, engine):
+        """Reads orders_table and the dim_* tables through the given
+        sqlalchemy engine and writes them to Parquet. Any previous
+        export in export_dir is overwritten. Returns a dict of the
+        number of rows written per table."""
+        os.makedirs(self.export_dir, exist_ok=True)
+        row_counts = {}
+
+        for table_name in DIM_TABLES:
+            df = self.__parquet_safe(pd.read_sql_table(table_name, con=engine))
+            df.to_parquet(self.__table_path(table_name), index=False)
+            row_counts[table_name] = len(df)
+            if table_name == "dim_date_times":
+                order_dates = df[["date_uuid"] + ORDERS_PARTITION_COLS]
+
+        orders = self.__parquet_safe(pd.read_sql_table(ORDERS_TABLE, con=engine))
+        orders = orders.merge(order_dates, on="date_uuid", how="left")
+        orders_path = self.__table_path(ORDERS_TABLE)
+        if os.path.isdir(orders_path):
+            shutil.rmtree(orders_path) # stale partitions would be read back
+        orders.to_parquet(orders_path, partition_cols=ORDERS_PARTITION_COLS, index=False)
+        row_counts[ORDERS_TABLE] = len(orders)
+
+        return row_counts
+
+    def connect_duckdb(self):
+        """Creates an in-memory DuckDB connection with one view
+        per exported table, named as in the local database. The
+        year and month partition columns are excluded from the
+        orders_table view so that it matches the original table.
+        Returns the connection."""
+        import duckdb
+
+        con = duckdb.connect()
+        for table_name in DIM_TABLES:
+            path = self.__table_path(table_name).replace("'", "''")
+            con.execute(f"CREATE VIEW {table_name} AS SELECT * FROM read_parquet('{path}')")
+
+        orders_glob = os.path.join(self.__table_path(ORDERS_TABLE), "**", "*.parquet").replace("'", "''")
+        con.execute(
+            f"CREATE VIEW {ORDERS_TABLE} AS "
+            f"SELECT * EXCLUDE ({', '.join(ORDERS_PARTITION_COLS)}) "
+            f"FROM read_parquet('{orders_glob}', hive_partitioning = true)"
+        )
+
+        return con
+
+    def execute_sql_file(self, sql_filepath):
+        """Reads an SQL query file given its sql_filepath and
+        executes each statement against the exported files. Returns
+        a list containing the response rows of every statement, in
+        the same form as
+        DatabaseConnector.execute_sql_file(pull_response=True)."""
+        with open(sql_filepath, 'r') as file:
+            sql_statements = file.read()
+
+        return self.execute_sql_statements(sql_statements.split(';'))
+
+    def execute_sql_statements(self, statements):
+        """Executes a list of SQL statements against the exported
+        files, after translating them with DUCKDB_TRANSLATIONS.
+        Returns a list containing the response rows of every
+        non-empty statement."""
+        response_array = []
+        con = self.connect_duckdb()
+        try:
+            for statement in statements:
+                if statement.strip():
+                    statement = _DUCKDB_TRANSLATION_REGEX.sub(
+                        lambda match: _DUCKDB_TRANSLATIONS_LOWER[match.group(0).lower()], statement)
+                    query_response = con.execute(statement).fetchall()
+                    response_array.append([list(response) for response in query_response])
+        finally:
+            con.close()
+
+        return response_array
@@ -1,10 +1,22 @@
 import pandas as pd
 import numpy as np
-import database_utils as utils
-import data_extraction as ext
 import re
 
 
+# Factor converting one of each weight unit to kg. Add entries
+# here, or pass weight_units to DataCleaning(), to support new units.
+WEIGHT_UNITS_KG = {
+    "kg": 1.0,
+    "g": 0.001,
+    "ml": 0.001, # assumes the density of water
+    "oz": 0.0283495,
+}
+
+# Weight class boundaries in kg: [lower, upper) for each class.
+WEIGHT_CLASS_BINS = [-np.inf, 2, 40, 140, np.inf]
+WEIGHT_CLASS_LABELS = ["Light", "Mid_Sized", "Heavy", "Truck_Required"]
+
+
 class DataCleaning():
 
     """Data cleaning class to clean pandas dataframes for
@@ -16,8 +28,22 @@ class DataCleaning():
     company customer, card, store, products, orders and date
     events data. All methods are unique to this specific 
     dataset and their dataframe columns.
+
+    If a DataQuality object is passed as quality, every clean_*
+    method records the rows it rejects and a per-column profile
+    to it before returning.
+
+    weight_units maps additional (or overriding) product weight
+    units to their factor in kg, on top of WEIGHT_UNITS_KG. Units
+    are case-insensitive.
     """
 
+    def __init__(self, quality=None, weight_units=None):
+        self.quality = quality
+        # Units are matched lowercased, whatever their case in the data
+        self.weight_units_kg = {unit.lower(): factor for unit, factor in
+                                {**WEIGHT_UNITS_KG, **(weight_units or {})}.items()}
+
     def __name_cleaning(self, df, target_col):
         """Method to clean customer first/last names. A regex
         is used to match entries to a alphabetical word
@@ -95,11 +121,12 @@ class DataCleaning():
 
         def parse_flexible_date(date_str):
             # Try to parse each date entry using dateutil.parser.parse.
-            # If entry raises a ValueError within the parser, set entry to NaT.
+            # If entry raises a ValueError within the parser, or is not a
+            # string (NaN, as read_csv reads "NULL"), set entry to NaT.
             try:
                 parsed_date = parse(date_str)
                 return parsed_date
-            except ValueError:
+            except (ValueError, TypeError):
                 return pd.NaT
 
         df[target_col] = df[target_col].astype(str).apply(parse_flexible_date)
@@ -204,6 +231,29 @@ class DataCleaning():
         else:
             return np.nan
         
+    def __snapshot(self, df):
+        """Helper method, returns a copy of the raw dataframe
+        if data quality results are being recorded, otherwise
+        None. Taken before any column is cleaned in place."""
+        if self.quality is not None:
+            return df.copy()
+
+    def __validated(self, df, null_entries):
+        """Helper method, returns a copy of the validated dataframe
+        with null_entries standardised to np.nan if data quality
+        results are being recorded, otherwise None. Taken before
+        duplicates are dropped, so that every rejected row keeps
+        the reason codes of its own invalid entries."""
+        if self.quality is not None:
+            return df.replace(null_entries, np.nan)
+
+    def __record_quality(self, table_name, raw_df, validated_df, clean_df):
+        """Helper method, passes the raw, validated and clean
+        dataframes of a table to the DataQuality object, if
+        one was given."""
+        if self.quality is not None:
+            self.quality.record(table_name, raw_df, validated_df, clean_df)
+
     def __in_list(self, entry, target_list):
         """Helper method, takes an entry
         and checks if it is contained within
@@ -228,6 +278,7 @@ class DataCleaning():
         uuid_regex = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
         spam_entry_regex = r'^(?![A-Z0-9]{10}$|[A-Z]{3,}$).*$'
         valid_countries = ['Germany', 'United Kingdom', 'United States']
+        raw_df = self.__snapshot(df)
 
         cols_to_drop = ['index']
         if all(col in df.columns for col in cols_to_drop):
@@ -249,13 +300,15 @@ class DataCleaning():
                                                         args=(spam_entry_regex, ))
         df['user_uuid'] = df['user_uuid'].astype(str).apply(self.__regex_matcher, \
                                 args=(uuid_regex, ))
+        validated_df = self.__validated(df, ['NULL', 'Null', 'null'])
         df = df.drop_duplicates() # remove any exact duplicates
 
         # Standardise all invalid entries (make them all np.nan)
         df = df.fillna(np.nan)
         df.replace(['NULL', 'Null', 'null'], np.nan, inplace=True)
-        df.dropna(inplace=True, how='all')
-        df.dropna(inplace=True, thresh=9)
+        df = df.dropna(how='all')
+        df = df.dropna(thresh=9)
+        self.__record_quality("dim_users", raw_df, validated_df, df)
 
         return df
 
@@ -320,6 +373,7 @@ class DataCleaning():
             return df
 
         # Ops
+        raw_df = self.__snapshot(df)
         df = df[['card_number', 'expiry_date', 'card_provider', 'date_payment_confirmed']]
         df['card_number'] = df['card_number'].astype(str)
 
@@ -328,10 +382,12 @@ class DataCleaning():
         df = self.__date_cleaning(df, target_col='date_payment_confirmed', date_format="%Y-%m-%d")
         df = __clean_expiry_date(df, "expiry_date")
 
+        validated_df = self.__validated(df, ['NULL'])
         df = df.drop_duplicates() # remove any exact duplicates
         df = df.fillna(np.nan)
         df.replace('NULL', np.nan, inplace=True)
-        df.dropna(inplace=True)
+        df = df.dropna()
+        self.__record_quality("dim_card_details", raw_df, validated_df, df)
 
         return df
 
@@ -356,6 +412,7 @@ class DataCleaning():
         values are replaced with np.nan.
         Return: cleaned df.
         """
+        raw_df = self.__snapshot(df)
         cols_to_drop = ['lat', 'index']
         if all(col in df.columns for col in cols_to_drop):
             df = df.drop(columns=cols_to_drop)
@@ -390,41 +447,43 @@ class DataCleaning():
         df["continent"] = df["continent"].apply(\
                 lambda x: x.strip() if str(x).strip() in valid_continents else np.nan)
         
+        validated_df = self.__validated(df, ['NULL', 'Null', 'null'])
         df = df.drop_duplicates() # remove any exact duplicates
         df = df.fillna(np.nan)
         df.replace('NULL', np.nan, inplace=True)
         df.replace('Null', np.nan, inplace=True)
         df.replace('null', np.nan, inplace=True)
-        df.dropna(inplace=True, how="all")
+        df = df.dropna(how="all")
+        self.__record_quality("dim_store_details", raw_df, validated_df, df)
 
         return df
 
     
-    def __convert_product_weights(self, df, target_col):
+    def __convert_product_weights(self, df, target_col, class_col="weight_class"):
         """Hepler method to clean and validate the "weight" column
-        of the products dataframe. 
+        of the products dataframe. A single vectorised str.extract
+        splits every entry into an optional multiplier ("12 x"), a
+        value and a unit, e.g. "12 x 100g", "16oz" or "77g .". Units
+        are lowercased and converted to kg by looking their factor up
+        in an array indexed by the unit's position in weight_units_kg.
+        Unknown units and unparseable entries are set to np.nan. The
+        weight class is assigned in the same pass with pd.cut on
+        WEIGHT_CLASS_BINS.
+        Return: cleaned dataframe.
         """
+        parts = df[target_col].astype(str).str.extract(
+            r'^\s*(?:(\d+)\s*x\s*)?([\d.]+)\s*([a-zA-Z]+)')
+        multiplier = pd.to_numeric(parts[0], errors='coerce').fillna(1).to_numpy()
+        value = pd.to_numeric(parts[1], errors='coerce').to_numpy()
 
-        def weights_validation(weight):
-            weight = str(weight)
-            match = re.match(r'(?:(\d+)\s*x\s*)?([\d.]+)\s*([a-zA-Z]+)', weight)
-            if match:
-                multiplier, value, unit = match.groups()
-                multiplier = int(multiplier) if multiplier else 1
-                value = float(value)
-
-                if unit == "kg":
-                    return multiplier * value
-                elif unit == "g" or unit == "ml":
-                    return multiplier * (value / 1000)
-                elif unit == "oz":
-                    return multiplier * (value * 0.0283495)  # 1 oz = 0.0283495 kg
-                else:
-                    return np.nan
-            else:
-                return np.nan
-        
-        df[target_col] = df[target_col].astype(str).apply(weights_validation)
+        units = list(self.weight_units_kg)
+        unit_codes = pd.Index(units).get_indexer(parts[2].str.lower())
+        factors = np.append(np.array(list(self.weight_units_kg.values()), dtype=float), np.nan)
+        weight = multiplier * value * factors[unit_codes] # code -1 (unknown unit) -> np.nan
+
+        df[target_col] = weight
+        df[class_col] = pd.cut(weight, bins=WEIGHT_CLASS_BINS, labels=WEIGHT_CLASS_LABELS,
+                               right=False).astype(object)
 
         return df
 
@@ -439,6 +498,8 @@ class DataCleaning():
         regex that matches to a 10-character str containing numbers and/or 
         all uppercase chars. This, of course, does not invalidate spam entries 
         that are not 10 characters long.
+        Weights are converted to kg and the weight_class column
+        is added by __convert_product_weights.
         
         Return: cleaned df.
         """
@@ -456,6 +517,8 @@ class DataCleaning():
         product_code_regex = r'^[A-Za-z]\d{1,2}-\d+[a-zA-Z]?$'
         spam_entry_regex = r'^(?![A-Za-z0-9]{10}$).*$' # negative assert, as this is the pattern for invalid entries
 
+        raw_df = self.__snapshot(df)
+
         # Drop empty col
         cols_to_drop = ['Unnamed: 0']
         if all(col in df.columns for col in cols_to_drop):
@@ -480,10 +543,12 @@ class DataCleaning():
         df['product_code'] = df['product_code'].astype(str).apply(self.__regex_matcher, \
                                                 args=(product_code_regex, ))
         
+        validated_df = self.__validated(df, ['NULL', 'nan'])
         df = df.drop_duplicates() # remove any exact duplicates
         df = df.fillna(np.nan)
         df.replace(['NULL', 'nan'], np.nan, inplace=True)
-        df.dropna(inplace=True)
+        df = df.dropna()
+        self.__record_quality("dim_products", raw_df, validated_df, df)
             
         return df
 
@@ -517,6 +582,8 @@ class DataCleaning():
         year_regex = r'^(19\d{2}|20\d{2})$'
         date_uuid_regex = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
 
+        raw_df = self.__snapshot(df)
+
         # Cleaning ops
         df["timestamp"] = df["timestamp"].astype(str).apply(self.__regex_matcher, args=(timestamp_regex, ))
         df['month'] = df['month'].astype(str).apply(lambda x: x if x.isdigit() and 1 <= float(x) <= 12 else np.nan)
@@ -526,9 +593,11 @@ class DataCleaning():
                             args=(["Evening", "Morning", "Midday", "Late_Hours"], ))
         df["date_uuid"] = df["date_uuid"].astype(str).apply(self.__regex_matcher, args=(date_uuid_regex, ))
 
+        validated_df = self.__validated(df, ['NULL'])
         df = df.drop_duplicates() # remove any exact duplicates
         df = df.fillna(np.nan)
         df.replace('NULL', np.nan, inplace=True)
-        df.dropna(inplace=True)
+        df = df.dropna()
+        self.__record_quality("dim_date_times", raw_df, validated_df, df)
 
-        return df   
\ No newline at end of file
+        return df
\ No newline at end of file
@@ -1,19 +1,51 @@
+import time
+
 import pandas as pd
-import database_utils as utils
+
 
 class DataExtractor():
     """Class to extract data from a AWS RDS instance, S3 bucket or 
     PDF file. Provides methods to create HTTP request to pull data
-    from an endpoint."""
+    from an endpoint. tabula, requests and boto3 are imported inside
+    the methods that use them, so importing this module stays cheap.
+
+    HTTP requests answered with a 5xx response code are retried up
+    to max_retries times, waiting backoff * 2**attempt seconds
+    between attempts. request_retries counts the retries made and
+    request_errors the requests that still failed."""
+
+    def __init__(self, max_retries=3, backoff=0.5):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.request_retries = 0
+        self.request_errors = 0
+
+    def __get(self, endpoint, header_dict=None):
+        """Helper method, sends a HTTP GET request to endpoint,
+        retrying while the response code is 5xx. Returns the last
+        response."""
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            response = requests.get(endpoint, headers=header_dict)
+            if response.status_code < 500 or attempt == self.max_retries:
+                break
+            self.request_retries += 1
+            time.sleep(self.backoff * 2 ** attempt)
+        if response.status_code != 200:
+            self.request_errors += 1
 
-    def read_rds_table(self, db_connector, target_table):
+        return response
+
+    def read_rds_table(self, db_connector, target_table,
+                       creds_filepath="db_credentials.yaml"):
         """Takes a db_connector class object from database_utils
         and calls init_db_engine to initialise an sqlalchemy engine.
-        Takes the db_credentials.yaml file. Connects to AWS RDS and
+        Takes the creds_filepath .yaml file. Connects to AWS RDS and
         reads SQL table, converting it to a pandas dataframe, unless
         an exception is raised. Return dataframe or raised exception."""
 
-        engine = db_connector.init_db_engine("db_credentials.yaml")
+        engine = db_connector.init_db_engine(creds_filepath)
         conn = engine.execution_options(isolation_level='AUTOCOMMIT').connect()
         try:
             table_dataframe = pd.read_sql_table(target_table, con=engine)
@@ -40,9 +72,7 @@ class DataExtractor():
         the 'number_of_stores' column is extracted from the data
         and returned, otherwise the failure code is returned."""
 
-        import requests
-
-        response = requests.get(endpoint, headers=header_dict)
+        response = self.__get(endpoint, header_dict)
         if response.status_code == 200:
             data = response.json()
             return data['number_stores']
@@ -58,13 +88,14 @@ class DataExtractor():
         completion of the loop, stores_list is returned as a pandas
         dataframe."""
         
-        import requests
+        if num_stores is None:
+            raise ValueError("Number of stores is unknown, the number of stores request failed.")
 
         stores_list = []
 
         for i in range(0, num_stores+1):
             current_endpoint = endpoint + str(i) # store number
-            response = requests.get(current_endpoint, headers=header_dict)
+            response = self.__get(current_endpoint, header_dict)
             if response.status_code == 200:
                 store_data = response.json()
                 stores_list.append(store_data)
@@ -75,17 +106,33 @@ class DataExtractor():
 
         return store_df
     
-    def extract_from_s3(self, uri):
+    def extract_json(self, endpoint):
+        """Sends a HTTP GET request to a given endpoint serving
+        a JSON document. If successful response code (200), the
+        data is returned as a pandas dataframe, otherwise the
+        failure code is printed."""
+
+        response = self.__get(endpoint)
+        if response.status_code == 200:
+            data = response.json()
+            df = pd.DataFrame(data)
+            return df
+        else:
+            print(f"Error: {response.status_code} - {response.text}")
+
+    def extract_from_s3(self, uri, endpoint_url=None):
         """Takes an AWS S3 bucket URI, strips it into
         the bucket_name and obj_key and initialises 
-        a boto3 S3 client to extract the data. Returns
-        the CSV data as a pandas dataframe."""
+        a boto3 S3 client to extract the data. An
+        endpoint_url can be given to use an S3-compatible
+        server other than AWS. Returns the CSV data as
+        a pandas dataframe."""
         import boto3, io
 
         uri = uri[5:] # Removes the 's3://' prefix
         bucket_name, obj_key = uri.split('/', 1) # strip
 
-        s3 = boto3.client('s3')
+        s3 = boto3.client('s3', endpoint_url=endpoint_url)
         file = s3.get_object(Bucket=bucket_name, Key=obj_key)
         file = file['Body'].read()
         bytes_io = io.BytesIO(file)
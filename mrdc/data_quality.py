@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+
+# Raw entries which the cleaners standardise to np.nan as missing
+# data, rather than invalidating them.
+NULL_STRINGS = ['NULL', 'Null', 'null', 'nan']
+
+
+class DataQuality():
+    """Class collecting data quality results from DataCleaning runs.
+
+    For every cleaned table the rows dropped by the cleaner are kept
+    in a quarantine dataframe along with a reason code per column,
+    and a profile of every column (null rate, distinct count and
+    number of values rejected) is computed. All results are derived
+    from boolean null masks of the raw and validated dataframes, so
+    no per-row Python code is run.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or pd.Timestamp.now().strftime("%Y%m%d%H%M%S")
+        self.rejected = {}
+        self.profiles = {}
+
+    def record(self, table_name, raw_df, validated_df, clean_df):
+        """Records the results of cleaning a single table, given
+        the raw_df passed to the cleaner, the validated_df where
+        all invalid entries have been set to np.nan (but no rows
+        have been dropped yet, not even duplicates) and the final
+        clean_df. All three must share the raw dataframe index.
+
+        Reason codes are "<col>:invalid" for entries the cleaner
+        rejected and "<col>:missing" for entries that were already
+        null in the raw data. Rows that were exact duplicates in the
+        raw data are quarantined as "duplicate", and valid rows that
+        only became duplicates once cleaned as "cleaned_duplicate".
+        """
+        cols = [col for col in validated_df.columns if col in raw_df.columns]
+        raw = raw_df.loc[validated_df.index, cols]
+
+        nulls = validated_df[cols].isna()
+        raw_missing = raw.isna() | raw.isin(NULL_STRINGS)
+        invalid = nulls & ~raw_missing
+        missing = nulls & raw_missing
+
+        reasons = pd.Series("", index=validated_df.index, dtype=object)
+        for col in cols:
+            codes = np.where(invalid[col].to_numpy(), f"{col}:invalid;",
+                             np.where(missing[col].to_numpy(), f"{col}:missing;", ""))
+            reasons = reasons + codes.astype(object)
+
+        rejected_index = validated_df.index.difference(clean_df.index)
+        reject_reason = reasons[rejected_index].str.rstrip(";").replace("", "cleaned_duplicate")
+        reject_reason = reject_reason.mask(raw.duplicated()[rejected_index], "duplicate")
+        quarantine = raw_df.loc[rejected_index].copy()
+        quarantine['reject_reason'] = reject_reason
+        quarantine['run_id'] = self.run_id
+        self.rejected[table_name] = quarantine
+
+        self.profiles[table_name] = pd.DataFrame({
+            "run_id": self.run_id,
+            "table_name": table_name,
+            "column_name": cols,
+            "rows_in": len(raw_df),
+            "rows_out": len(clean_df),
+            "null_rate": nulls.mean().to_numpy(),
+            "distinct_count": validated_df[cols].nunique().to_numpy(),
+            "reject_count": invalid.sum().to_numpy(),
+        })
+
+    def quarantine_frame(self, table_name):
+        """Returns the rejected rows recorded for table_name."""
+        return self.rejected[table_name]
+
+    def profile_frame(self, table_name=None):
+        """Returns the column profile for table_name, or of every
+        recorded table concatenated if table_name is not given."""
+        if table_name is not None:
+            return self.profiles[table_name]
+        return pd.concat(self.profiles.values(), ignore_index=True)
@@ -1,13 +1,21 @@
 import yaml
-from sqlalchemy import create_engine, inspect, text
 
 class DatabaseConnector():
     """Class specifying methods to perform database operations
     such as reading credentials from a .yaml file, creating a
     sqlalchemy engine, listing tables found in a target 
     database and uploading to a target database.
+
+    sqlalchemy is imported inside the methods that need it so that
+    importing this module does not load the engine or its dialects.
+
+    If a TableVersions object is passed as table_versions, the
+    version of every table uploaded with upload_to_db is bumped.
     """
 
+    def __init__(self, table_versions=None):
+        self.table_versions = table_versions
+
     def read_db_creds(self, creds_filepath):
         """Safe loads a .yaml file, given a creds_filepath.
         Returns the data.
@@ -22,6 +30,8 @@ class DatabaseConnector():
         creds_filepath. Initialises a sqlalchemy engine
         to establish a connection to the remote database using 
         the provided credentials. Returns engine object."""
+        from sqlalchemy import create_engine
+
         creds = self.read_db_creds(creds_filepath)
         engine_url = ( 
             f'postgresql://{creds["RDS_USER"]}:'
@@ -37,6 +47,8 @@ class DatabaseConnector():
         object which is used to connect to the remote.
         Connection is closed after the table names are 
         extracted and returned."""
+        from sqlalchemy import inspect
+
         conn = engine.execution_options(isolation_level='AUTOCOMMIT').connect()
         inspector = inspect(conn)
         table_names = inspector.get_table_names()
@@ -49,6 +61,8 @@ class DatabaseConnector():
         creds_filepath. Initialises a sqlalchemy engine
         to establish a connection to the local database using 
         the provided credentials. Returns engine object."""
+        from sqlalchemy import create_engine
+
         creds = self.read_db_creds(creds_filepath)
         engine_url = ( 
             f'postgresql://{creds["LOCAL_USER"]}:'
@@ -59,12 +73,15 @@ class DatabaseConnector():
 
         return engine
 
-    def upload_to_db(self, df, table_name, creds_filepath):
+    def upload_to_db(self, df, table_name, creds_filepath, if_exists='replace'):
         """Calls read_db_creds() method to extract credentials
         to the local database, creating an sqlalchemy engine
         with these credentials. Takes a pandas dataframe and 
         uploads it to this target database, replacing if
-        already exists."""
+        already exists (pass if_exists='append' to add rows
+        to an existing table instead)."""
+        from sqlalchemy import create_engine
+
         creds = self.read_db_creds(creds_filepath)
         engine_url = ( 
             f'postgresql://{creds["LOCAL_USER"]}:'
@@ -73,22 +90,42 @@ class DatabaseConnector():
         )
         engine = create_engine(engine_url)
 
-        df.to_sql(table_name, con=engine, if_exists='replace', index=False)
+        df.to_sql(table_name, con=engine, if_exists=if_exists, index=False)
+        if self.table_versions is not None:
+            self.table_versions.bump(table_name)
+
+    def read_sql_file(self, sql_filepath):
+        """Reads an SQL query file given its sql_filepath and
+        splits it into statements. Returns the list of non-empty
+        statements."""
+        with open(sql_filepath, 'r') as file:
+            sql_statements = file.read()
+
+        return [statement for statement in sql_statements.split(';') if statement.strip()]
 
     def execute_sql_file(self, engine, sql_filepath, pull_response=False):
         """Reads an SQL query file given its sql_filepath.
         Executes the statements within the file given the 
         target "engine"."""
-        with open(sql_filepath, 'r') as file:
-            sql_statements = file.read()
+        statements = self.read_sql_file(sql_filepath)
+
+        return self.execute_sql_statements(engine, statements, pull_response)
+
+    def execute_sql_statements(self, engine, statements, pull_response=False):
+        """Executes a list of SQL statements given the target
+        "engine", in a single transaction which is committed if
+        every statement succeeds. If pull_response, returns a list
+        containing the response rows of every statement (empty for
+        statements that do not return rows, such as ALTER TABLE)."""
+        from sqlalchemy import text
 
-        statements = sql_statements.split(';')
         response_array = [] # list containing response lists of entire SQL file
 
-        with engine.connect() as connection:
+        with engine.begin() as connection:
             for statement in statements:
                 if statement.strip():
-                    query_response = connection.execute(text(statement)).fetchall()
+                    result = connection.execute(text(statement))
+                    query_response = result.fetchall() if result.returns_rows else []
                     if pull_response:
                         query_response_list = [list(response) for response in query_response]
                         response_array.append(query_response_list)
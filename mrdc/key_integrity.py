@@ -0,0 +1,107 @@
+import pandas as pd
+
+
+# Primary key of every dimension table, as set up in constraint_queries.sql.
+PRIMARY_KEYS = {
+    "dim_users": "user_uuid",
+    "dim_store_details": "store_code",
+    "dim_products": "product_code",
+    "dim_date_times": "date_uuid",
+    "dim_card_details": "card_number",
+}
+
+# orders_table foreign key columns and the dimension tables they reference.
+FOREIGN_KEYS = {
+    "user_uuid": "dim_users",
+    "store_code": "dim_store_details",
+    "product_code": "dim_products",
+    "date_uuid": "dim_date_times",
+    "card_number": "dim_card_details",
+}
+
+VIOLATION_COLUMNS = ["table_name", "column_name", "key", "violation", "row_count"]
+
+
+class KeyIntegrity():
+    """Class to check the primary and foreign key constraints in
+    constraint_queries.sql against the cleaned dataframes before
+    they are uploaded, so that key violations are reported with the
+    offending keys instead of failing in Postgres after the load.
+
+    The key set of every checked dimension table is kept in memory
+    and orders_table is checked against these sets. All keys are
+    compared as strings, which is how the constraint queries cast
+    the orders_table columns before the foreign keys are added.
+    """
+
+    def __init__(self):
+        self.key_sets = {}
+        self.violations = []
+
+    def check_primary_key(self, table_name, df):
+        """Checks that the primary key column of table_name is
+        unique and has no nulls in df, and stores its key set for
+        the foreign key checks. Any violations are recorded and
+        returned as a dataframe."""
+        key_col = PRIMARY_KEYS[table_name]
+        keys = df[key_col]
+
+        null_count = int(keys.isna().sum())
+        keys = keys.dropna().astype(str)
+        counts = keys.value_counts()
+        duplicates = counts[counts > 1]
+
+        report = pd.DataFrame({
+            "table_name": table_name,
+            "column_name": key_col,
+            "key": duplicates.index,
+            "violation": "duplicate_pk",
+            "row_count": duplicates.to_numpy(),
+        })
+        if null_count:
+            report.loc[len(report)] = [table_name, key_col, None, "null_pk", null_count]
+
+        self.key_sets[table_name] = pd.Index(counts.index)
+        self.__record(report)
+
+        return report
+
+    def check_foreign_keys(self, df, table_name="orders_table"):
+        """Checks every foreign key column of df against the key
+        set of the dimension table it references. Keys that are not
+        present in the dimension table are orphans and are recorded
+        and returned as a dataframe, one row per orphan key. Columns
+        whose dimension table has not been checked are skipped."""
+        reports = []
+        for key_col, dim_table in FOREIGN_KEYS.items():
+            if dim_table not in self.key_sets or key_col not in df.columns:
+                print(f"Skipping {key_col}: {dim_table} key set not available.")
+                continue
+            keys = df[key_col].dropna().astype(str)
+            orphans = keys[~keys.isin(self.key_sets[dim_table])].value_counts()
+            reports.append(pd.DataFrame({
+                "table_name": table_name,
+                "column_name": key_col,
+                "key": orphans.index,
+                "violation": f"orphan_fk:{dim_table}",
+                "row_count": orphans.to_numpy(),
+            }))
+
+        report = pd.concat(reports, ignore_index=True) if reports else \
+            pd.DataFrame(columns=VIOLATION_COLUMNS)
+        self.__record(report)
+
+        return report
+
+    def violations_frame(self):
+        """Returns every violation recorded so far as a dataframe."""
+        if not self.violations:
+            return pd.DataFrame(columns=VIOLATION_COLUMNS)
+        return pd.concat(self.violations, ignore_index=True)
+
+    def __record(self, report):
+        """Stores and prints a summary of a non-empty report."""
+        if len(report):
+            self.violations.append(report)
+            summary = report.groupby(["table_name", "column_name", "violation"])["row_count"].agg(["count", "sum"])
+            print(f"Key violations found:\n{summary}")
@@ -0,0 +1,562 @@
+"""End-to-end load test: ``python -m mrdc.load_test [options]``.
+
+Generates MRDC-shaped source data at a configurable scale, serves it
+from local stand-ins and drives the full Pipeline against them:
+
+- a throwaway Postgres server holding a "remote" database (the
+  legacy_users and orders_table RDS tables) and a "local" database
+  (the star schema). Either an admin URL to a disposable server is
+  given, or one is started with testing.postgresql;
+- a moto S3 server holding the products CSV;
+- a stub HTTP server for the card details PDF, the date events JSON
+  and the store API, with configurable latency and error rate.
+
+Every endpoint, URI and credential is written to a generated
+credentials file, which is the only configuration the pipeline gets.
+The wall time, rows and rows/s of every stage are reported at the end.
+moto, reportlab (to write the card PDF) and, without --postgres-url,
+testing.postgresql are required in addition to the pipeline's own
+dependencies.
+"""
+
+import argparse
+import http.server
+import io
+import json
+import os
+import random
+import socket
+import string
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from .pipeline import Pipeline
+
+
+# Raw table each source stage loads, used to report rows/s.
+STAGE_TABLES = {
+    "card": "dim_card_details",
+    "dates": "dim_date_times",
+    "products": "dim_products",
+    "stores": "dim_store_details",
+    "users": "dim_users",
+    "orders": "orders_table",
+}
+
+S3_BUCKET = "mrdc-load-test"
+S3_KEY = "products.csv"
+STORES_API_KEY = "load-test-key"
+
+# Junk tokens use digits and letters which dateutil cannot read as part
+# of a date (no month/day names, am/pm, h/m/s, t, z, nd, st, rd or th).
+_JUNK_LETTERS = list("BCFGJKLQVWXY")
+_JUNK_CHARS = list(string.digits) + _JUNK_LETTERS
+
+
+def free_port():
+    """Returns a TCP port on 127.0.0.1 that is currently free."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class SyntheticData():
+    """Class generating source datasets in the shape and formats of
+    the MRDC sources, for a given number of orders (scale). The other
+    tables are sized relative to the orders table as in the original
+    data. Every orders_table key references a valid row of its
+    dimension table, and invalid_rate extra junk rows, which every
+    cleaner rejects, are appended to each dimension source.
+    """
+
+    def __init__(self, scale, invalid_rate=0.01, seed=0):
+        self.scale = scale
+        self.invalid_rate = invalid_rate
+        self.rng = np.random.default_rng(seed)
+
+    def __uuids(self, n):
+        return [str(uuid.UUID(bytes=self.rng.bytes(16), version=4)) for _ in range(n)]
+
+    def __choice(self, options, n):
+        return np.asarray(options, dtype=object)[self.rng.integers(0, len(options), n)]
+
+    def __dates(self, n, start="1990-01-01", end="2022-12-31"):
+        span = (pd.Timestamp(end) - pd.Timestamp(start)).days
+        days = self.rng.integers(0, span, n)
+        return (pd.Timestamp(start) + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d").tolist()
+
+    def __junk(self, df, date_cols=()):
+        """Appends invalid_rate * len(df) rows of 10-character
+        junk tokens to df, e.g. "7QK0B3XWL9". Date columns get
+        "NULL" instead, so they cannot parse as a date."""
+        n = int(len(df) * self.invalid_rate)
+        if not n:
+            return df
+        tokens = np.asarray(_JUNK_CHARS)[self.rng.integers(0, len(_JUNK_CHARS), (n, 10))]
+        tokens[:, 0] = self.__choice(list(string.digits), n)
+        tokens[:, 1] = self.__choice(_JUNK_LETTERS, n)
+        tokens = ["".join(token) for token in tokens]
+        junk = pd.DataFrame({col: "NULL" if col in date_cols else tokens for col in df.columns})
+
+        return pd.concat([df, junk], ignore_index=True)
+
+    def generate(self):
+        """Generates every dataset and stores them as attributes:
+        users, cards, stores, products, dates and orders. The
+        dimension datasets include their junk rows."""
+        n_orders = self.scale
+        n_users = max(10, n_orders // 8)
+        n_products = max(10, n_orders // 65)
+        n_stores = max(5, n_orders // 265)
+
+        countries = self.__choice([("United Kingdom", "GB"), ("Germany", "DE"), ("United States", "US")], n_users)
+        country_codes = np.array([code for _, code in countries], dtype=object)
+        local_numbers = self.rng.integers(0, 10000, n_users)
+        phone_formats = {"GB": "020 7946 {:04d}", "DE": "030 123{:04d}", "US": "(202) 555-{:04d}"}
+        first_names = self.__choice(["Sigfried", "Guy", "Harry", "Anna", "Jürgen", "Lena", "Mary-Jane"], n_users)
+        last_names = self.__choice(["Noack", "Lewis", "Smith", "Müller", "O'Brien", "Johnson"], n_users)
+        users = pd.DataFrame({
+            "index": range(n_users),
+            "first_name": first_names,
+            "last_name": last_names,
+            "date_of_birth": self.__dates(n_users, "1940-01-01", "2005-12-31"),
+            "company": self.__choice(["Heydrich Junck Ltd", "Smith and Sons", "Fischer GmbH"], n_users),
+            "email_address": [f"{first}.{last}{i}@example.com".replace("'", "")
+                              for i, (first, last) in enumerate(zip(first_names, last_names))],
+            "address": [f"{i} High Street\nLondon\nE1 6AN" for i in range(n_users)],
+            "country": [country for country, _ in countries],
+            "country_code": country_codes,
+            "phone_number": [phone_formats[code].format(num) for code, num in zip(country_codes, local_numbers)],
+            "join_date": self.__dates(n_users, "2000-01-01", "2022-12-31"),
+            "user_uuid": self.__uuids(n_users),
+        })
+
+        n_cards = n_users
+        cards = pd.DataFrame({
+            "card_number": (4_000_000_000_000_000 + self.rng.permutation(n_cards) * 1_000_003).astype(str),
+            "expiry_date": [f"{m:02d}/{y:02d}" for m, y in zip(self.rng.integers(1, 13, n_cards),
+                                                                self.rng.integers(23, 30, n_cards))],
+            "card_provider": self.__choice(["VISA 16 digit", "Mastercard", "Discover", "JCB 16 digit"], n_cards),
+            "date_payment_confirmed": self.__dates(n_cards, "2000-01-01", "2022-12-31"),
+        })
+
+        store_countries = self.__choice([("GB", "Europe"), ("DE", "Europe"), ("US", "America")], n_stores)
+        stores = pd.DataFrame({
+            "index": range(n_stores),
+            "address": [f"Unit {i}\nMarket Square, Leeds" for i in range(n_stores)],
+            "longitude": self.rng.uniform(-10, 10, n_stores).round(5).astype(str),
+            "lat": None,
+            "locality": self.__choice(["High Wycombe", "Berlin", "Chapletown", "Lockport"], n_stores),
+            "store_code": [f"{prefix}-{i:08X}" for prefix, i in
+                           zip(self.__choice(["HI", "BE", "CH", "LO"], n_stores), range(n_stores))],
+            "staff_numbers": self.rng.integers(5, 120, n_stores).astype(str),
+            "opening_date": self.__dates(n_stores, "1990-01-01", "2020-12-31"),
+            "store_type": self.__choice(["Local", "Super Store", "Mall Kiosk", "Outlet"], n_stores),
+            "latitude": self.rng.uniform(40, 60, n_stores).round(5).astype(str),
+            "country_code": [code for code, _ in store_countries],
+            "continent": [continent for _, continent in store_countries],
+        })
+
+        weights = [f"{w}g" for w in self.rng.integers(50, 1000, n_products)]
+        weights = np.where(self.rng.random(n_products) < 0.2,
+                           [f"{m} x {w}" for m, w in zip(self.rng.integers(2, 12, n_products), weights)], weights)
+        product_letters = self.__choice(list(string.ascii_uppercase), n_products)
+        products = pd.DataFrame({
+            "product_name": [f"Product {i} Deluxe Edition" for i in range(n_products)],
+            "product_price": [f"£{price:.2f}" for price in self.rng.uniform(1, 200, n_products)],
+            "weight": weights,
+            "category": self.__choice(["toys-and-games", "sports-and-leisure", "pets", "homeware",
+                                       "health-and-beauty", "food-and-drink", "diy"], n_products),
+            "EAN": self.rng.integers(10**12, 10**13, n_products).astype(str),
+            "date_added": self.__dates(n_products, "2000-01-01", "2022-12-31"),
+            "uuid": self.__uuids(n_products),
+            "removed": self.__choice(["Still_avaliable", "Removed"], n_products),
+            "product_code": [f"{letter}{i % 100}-{i:06d}{letter}" for letter, i in zip(product_letters, range(n_products))],
+        })
+
+        date_uuids = self.__uuids(n_orders)
+        dates = pd.DataFrame({
+            "timestamp": [f"{h:02d}:{m:02d}:{s:02d}" for h, m, s in zip(self.rng.integers(0, 24, n_orders),
+                                                                        self.rng.integers(0, 60, n_orders),
+                                                                        self.rng.integers(0, 60, n_orders))],
+            "month": self.rng.integers(1, 13, n_orders).astype(str),
+            "year": self.rng.integers(1993, 2023, n_orders).astype(str),
+            "day": self.rng.integers(1, 29, n_orders).astype(str),
+            "time_period": self.__choice(["Evening", "Morning", "Midday", "Late_Hours"], n_orders),
+            "date_uuid": date_uuids,
+        })
+
+        user_rows = self.rng.integers(0, n_users, n_orders)
+        self.orders = pd.DataFrame({
+            "level_0": range(n_orders),
+            "index": range(n_orders),
+            "date_uuid": date_uuids,
+            "first_name": None,
+            "last_name": None,
+            "user_uuid": users["user_uuid"].to_numpy()[user_rows],
+            "card_number": cards["card_number"].to_numpy()[user_rows],
+            "store_code": self.__choice(stores["store_code"].tolist(), n_orders),
+            "product_code": self.__choice(products["product_code"].tolist(), n_orders),
+            "1": None,
+            "product_quantity": self.rng.integers(1, 13, n_orders),
+        })
+
+        self.users = self.__junk(users, ["date_of_birth", "join_date"])
+        self.cards = self.__junk(cards, ["date_payment_confirmed"])
+        self.stores = self.__junk(stores, ["opening_date"])
+        self.products = self.__junk(products, ["date_added"])
+        self.dates = self.__junk(dates)
+
+    def card_pdf(self):
+        """Returns the card details as PDF bytes, one table per
+        page with the header repeated, as read by tabula."""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import PageBreak, SimpleDocTemplate, Table
+
+        rows_per_page = 35
+        header = list(self.cards.columns)
+        story = []
+        for start in range(0, len(self.cards), rows_per_page):
+            page = self.cards.iloc[start:start + rows_per_page].astype(str)
+            story += [Table([header] + page.values.tolist()), PageBreak()]
+
+        buffer = io.BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4).build(story)
+
+        return buffer.getvalue()
+
+    def date_events_json(self):
+        """Returns the date events as JSON bytes, as a dict of
+        columns like the original date_details.json."""
+        return self.dates.to_json(orient="columns").encode("utf-8")
+
+    def products_csv(self):
+        """Returns the products as CSV bytes. The index is written
+        as an unnamed first column, read back as 'Unnamed: 0'."""
+        return self.products.to_csv(index=True).encode("utf-8")
+
+    def store_records(self):
+        """Returns the store API responses, one dict per store."""
+        return self.stores.to_dict(orient="records")
+
+
+class StubAPIServer():
+    """Threaded HTTP server standing in for the S3-hosted files and
+    the store API. Files are served from /files/<name>. The store API
+    endpoints /prod/number_stores and /prod/store_details/<n> check the
+    x-api-key header and wait latency seconds before responding, then
+    fail with a 500 response with probability error_rate.
+    """
+
+    def __init__(self, files, stores, api_key, latency=0.0, error_rate=0.0, seed=0):
+        self.files = files
+        self.stores = stores
+        self.api_key = api_key
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.server = None
+
+    def start(self):
+        """Starts serving on a free port in a daemon thread.
+        Returns the base URL of the server."""
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def respond(self, status, body, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith("/files/"):
+                    body = stub.files.get(self.path[len("/files/"):])
+                    if body is None:
+                        return self.respond(404, b'{"message": "Not Found"}')
+                    return self.respond(200, body, "application/octet-stream")
+
+                if self.headers.get("x-api-key") != stub.api_key:
+                    return self.respond(403, b'{"message": "Forbidden"}')
+                time.sleep(stub.latency)
+                if stub.random.random() < stub.error_rate:
+                    return self.respond(500, b'{"message": "Internal server error"}')
+
+                if self.path == "/prod/number_stores":
+                    body = {"statusCode": 200, "number_stores": len(stub.stores) - 1}
+                    return self.respond(200, json.dumps(body).encode("utf-8"))
+                if self.path.startswith("/prod/store_details/"):
+                    store_number = self.path[len("/prod/store_details/"):]
+                    if store_number.isdigit() and int(store_number) < len(stub.stores):
+                        body = json.dumps(stub.stores[int(store_number)], default=str)
+                        return self.respond(200, body.encode("utf-8"))
+                self.respond(404, b'{"message": "Not Found"}')
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MotoS3Server():
+    """moto S3 server holding a single object, standing in for
+    the products bucket."""
+
+    def __init__(self, bucket, key, body):
+        self.bucket = bucket
+        self.key = key
+        self.body = body
+        self.server = None
+
+    def start(self):
+        """Starts the server on a free port and uploads the object.
+        Returns the endpoint URL of the server."""
+        import boto3
+        from moto.server import ThreadedMotoServer
+
+        # moto accepts any credentials, but boto3 needs some to sign requests.
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+        port = free_port()
+        self.server = ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+        self.server.start()
+        endpoint_url = f"http://127.0.0.1:{port}"
+
+        s3 = boto3.client("s3", endpoint_url=endpoint_url, region_name="us-east-1")
+        s3.create_bucket(Bucket=self.bucket)
+        s3.put_object(Bucket=self.bucket, Key=self.key, Body=self.body)
+
+        return endpoint_url
+
+    def stop(self):
+        self.server.stop()
+
+
+class ThrowawayPostgres():
+    """Creates a remote and a local database with unique names on a
+    disposable Postgres server and drops them again on stop(). The
+    server is given by an admin_url, or started with
+    testing.postgresql (which needs the Postgres binaries) if none
+    is given."""
+
+    def __init__(self, admin_url=None):
+        self.admin_url = admin_url
+        self.suffix = uuid.uuid4().hex[:8]
+        self.databases = {"RDS": f"mrdc_remote_{self.suffix}", "LOCAL": f"mrdc_local_{self.suffix}"}
+        self.postgresql = None
+
+    def start(self):
+        from sqlalchemy import create_engine, text
+
+        if self.admin_url is None:
+            import testing.postgresql
+            self.postgresql = testing.postgresql.Postgresql()
+            self.admin_url = self.postgresql.url()
+
+        engine = create_engine(self.admin_url, isolation_level="AUTOCOMMIT")
+        with engine.connect() as connection:
+            for database in self.databases.values():
+                connection.execute(text(f'CREATE DATABASE "{database}"'))
+        engine.dispose()
+
+    def url(self, prefix):
+        """Returns the sqlalchemy URL of the RDS or LOCAL database."""
+        from sqlalchemy.engine import make_url
+
+        return make_url(self.admin_url).set(database=self.databases[prefix])
+
+    def creds(self):
+        """Returns the RDS_* and LOCAL_* credentials of the two
+        databases, as expected in the credentials .yaml file."""
+        creds = {}
+        for prefix in self.databases:
+            url = self.url(prefix)
+            creds.update({
+                f"{prefix}_HOST": url.host or "localhost",
+                f"{prefix}_PASSWORD": url.password or "",
+                f"{prefix}_USER": url.username,
+                f"{prefix}_DATABASE": url.database,
+                f"{prefix}_PORT": url.port or 5432,
+            })
+
+        return creds
+
+    def stop(self):
+        from sqlalchemy import create_engine, text
+
+        engine = create_engine(self.admin_url, isolation_level="AUTOCOMMIT")
+        with engine.connect() as connection:
+            for database in self.databases.values():
+                connection.execute(text(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)'))
+        engine.dispose()
+        if self.postgresql is not None:
+            self.postgresql.stop()
+
+
+class LoadTest():
+    """Class running the pipeline end to end against local
+    stand-ins at a given scale (number of orders) and reporting
+    the time, rows and rows/s of every stage."""
+
+    def __init__(self, scale=10000, invalid_rate=0.01, api_latency=0.0, api_error_rate=0.0,
+                 postgres_url=None, async_extract=False, max_concurrency=20, seed=0, work_dir=None):
+        self.scale = scale
+        self.invalid_rate = invalid_rate
+        self.api_latency = api_latency
+        self.api_error_rate = api_error_rate
+        self.postgres_url = postgres_url
+        self.async_extract = async_extract
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+        self.work_dir = work_dir
+
+    def __seed_remote(self, data, postgres):
+        """Loads the users and orders sources to the remote DB."""
+        from sqlalchemy import create_engine
+
+        engine = create_engine(postgres.url("RDS"))
+        data.users.to_sql("legacy_users", con=engine, if_exists="replace", index=False)
+        data.orders.to_sql("orders_table", con=engine, if_exists="replace", index=False)
+        engine.dispose()
+
+    def run(self):
+        """Generates the data, starts the stand-ins, runs every
+        pipeline stage and tears the stand-ins down. Returns the
+        per-stage report as a dataframe and the exception that
+        stopped the pipeline, if any."""
+        work_dir = self.work_dir or tempfile.mkdtemp(prefix="mrdc_load_test_")
+        os.makedirs(work_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        data = SyntheticData(self.scale, self.invalid_rate, self.seed)
+        data.generate()
+        files = {"card_details.pdf": data.card_pdf(), "date_details.json": data.date_events_json()}
+        generate_seconds = time.perf_counter() - start
+        print(f"Generated data for {self.scale} orders in {generate_seconds:.2f}s.")
+
+        api = StubAPIServer(files, data.store_records(), STORES_API_KEY,
+                            self.api_latency, self.api_error_rate, self.seed)
+        s3 = MotoS3Server(S3_BUCKET, S3_KEY, data.products_csv())
+        postgres = ThrowawayPostgres(self.postgres_url)
+        pipeline = None
+        failure = None
+        try:
+            base_url = api.start()
+            s3_endpoint_url = s3.start()
+            postgres.start()
+            self.__seed_remote(data, postgres)
+
+            creds = postgres.creds()
+            creds.update({
+                "CARD_PDF_URL": f"{base_url}/files/card_details.pdf",
+                "DATE_EVENTS_URL": f"{base_url}/files/date_details.json",
+                "PRODUCTS_S3_URI": f"s3://{S3_BUCKET}/{S3_KEY}",
+                "S3_ENDPOINT_URL": s3_endpoint_url,
+                "STORES_API_KEY": STORES_API_KEY,
+                "STORE_ENDPOINT": f"{base_url}/prod/store_details/",
+                "NUM_OF_STORES_ENDPOINT": f"{base_url}/prod/number_stores",
+            })
+            creds_filepath = os.path.join(work_dir, "db_credentials.yaml")
+            with open(creds_filepath, "w") as file:
+                yaml.safe_dump(creds, file)
+
+            pipeline = Pipeline(creds_filepath=creds_filepath,
+                                export_dir=os.path.join(work_dir, "star_schema_export"),
+                                cache_dir=os.path.join(work_dir, "cache"),
+                                async_extract=self.async_extract,
+                                max_concurrency=self.max_concurrency)
+            try:
+                pipeline.run()
+            except Exception as e:
+                failure = e
+                print(f"Error: {e}")
+        finally:
+            for stand_in in (postgres, s3, api):
+                try:
+                    stand_in.stop()
+                except Exception as e:
+                    print(f"Error stopping {type(stand_in).__name__}: {e}")
+
+        return self.report(pipeline), failure
+
+    def report(self, pipeline):
+        """Returns the time, rows, rows/s and HTTP retries and errors
+        of every stage that completed. Source stages count the rows of
+        the table they loaded, all other stages the rows of the whole
+        star schema."""
+        if pipeline is None:
+            return pd.DataFrame(columns=["stage", "seconds", "rows", "rows_per_s", "retries", "errors"])
+
+        total_rows = sum(pipeline.rows_loaded.values())
+        rows = [pipeline.rows_loaded.get(STAGE_TABLES.get(stage), total_rows)
+                for stage in pipeline.stage_timings]
+        report = pd.DataFrame({
+            "stage": list(pipeline.stage_timings),
+            "seconds": list(pipeline.stage_timings.values()),
+            "rows": rows,
+        })
+        report.loc[len(report)] = ["total", report["seconds"].sum(), total_rows]
+        report["rows_per_s"] = (report["rows"] / report["seconds"]).round(1)
+        request_counts = [pipeline.request_counts.get(stage, (0, 0)) for stage in pipeline.stage_timings]
+        report["retries"] = [retries for retries, _ in request_counts] + \
+            [sum(retries for retries, _ in request_counts)]
+        report["errors"] = [errors for _, errors in request_counts] + \
+            [sum(errors for _, errors in request_counts)]
+
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m mrdc.load_test",
+        description="Run the full pipeline against local stand-ins and report stage timings.")
+    parser.add_argument("--scale", type=int, default=10000,
+                        help="number of orders to generate; other tables are sized from it (default: %(default)s)")
+    parser.add_argument("--invalid-rate", type=float, default=0.01,
+                        help="fraction of junk rows added to each dimension source (default: %(default)s)")
+    parser.add_argument("--api-latency", type=float, default=0.0,
+                        help="seconds the stub store API waits per request (default: %(default)s)")
+    parser.add_argument("--api-error-rate", type=float, default=0.0,
+                        help="probability the stub store API responds with a 500 (default: %(default)s)")
+    parser.add_argument("--postgres-url", default=os.environ.get("MRDC_LOAD_TEST_POSTGRES_URL"),
+                        help="admin URL of a disposable Postgres server (default: $MRDC_LOAD_TEST_POSTGRES_URL, "
+                             "else one is started with testing.postgresql)")
+    parser.add_argument("--async-extract", action="store_true",
+                        help="extract all sources concurrently before the stages run")
+    parser.add_argument("--max-concurrency", type=int, default=20,
+                        help="maximum requests in flight with --async-extract (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("--work-dir", default=None,
+                        help="directory for the generated config, export and cache (default: a new temp dir)")
+    args = parser.parse_args(argv)
+
+    load_test = LoadTest(scale=args.scale, invalid_rate=args.invalid_rate, api_latency=args.api_latency,
+                         api_error_rate=args.api_error_rate, postgres_url=args.postgres_url,
+                         async_extract=args.async_extract, max_concurrency=args.max_concurrency,
+                         seed=args.seed, work_dir=args.work_dir)
+    report, failure = load_test.run()
+    print(report.to_string(index=False))
+    if failure is not None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
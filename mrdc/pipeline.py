@@ -0,0 +1,364 @@
+import asyncio
+import os
+import re
+import time
+
+from .async_extraction import AsyncDataExtractor
+from .columnar_export import ColumnarExport
+from .data_cleaning import DataCleaning
+from .data_quality import DataQuality
+from .data_extraction import DataExtractor
+from .database_utils import DatabaseConnector
+from .key_integrity import KeyIntegrity, PRIMARY_KEYS
+from .query_cache import QueryCache, TableVersions, referenced_tables
+
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql")
+CONSTRAINT_QUERIES_PATH = os.path.join(SQL_DIR, "constraint_queries.sql")
+ANALYTICS_QUERIES_PATH = os.path.join(SQL_DIR, "analytics.sql")
+
+# Source endpoints and URIs. Each can be overridden by setting the
+# same key in the credentials .yaml file, e.g. to point the pipeline
+# at local stand-ins.
+DEFAULT_SOURCES = {
+    "CARD_PDF_URL": "https://data-handling-public.s3.eu-west-1.amazonaws.com/card_details.pdf",
+    "DATE_EVENTS_URL": "https://data-handling-public.s3.eu-west-1.amazonaws.com/date_details.json",
+    "PRODUCTS_S3_URI": "s3://data-handling-public/products.csv",
+    "S3_ENDPOINT_URL": None, # None uses the AWS default
+    "STORE_ENDPOINT": "https://aqj7u5id95.execute-api.eu-west-1.amazonaws.com/prod/store_details/",
+    "NUM_OF_STORES_ENDPOINT": "https://aqj7u5id95.execute-api.eu-west-1.amazonaws.com/prod/number_stores",
+}
+# Source settings without a default, which must be set in the
+# credentials .yaml file.
+REQUIRED_SOURCES = ["STORES_API_KEY"]
+
+# (report title, tabulate header, tabulate floatfmt) for each query
+# in analytics.sql, in file order.
+ANALYTICS_REPORTS = [
+    ("Store Origin", ["Country", "Total Number of Stores"], None),
+    ("Locality Ranking", ["Locality", "Total Number of Stores"], None),
+    ("Total sales by month", ["Total Sales", "Month"], None),
+    ("Online vs. Offline", ["No. of Sales", "Product Quantity (count)", "Location"], None),
+    ("Sales of different store types", ["Store Type", "Total Sales", "Percentage Total (%)"], ".2f"),
+    ("Best sales historically by year and month", ["Total Sales", "Year", "Month"], ".2f"),
+    ("Staff headcount by operating country", ["Total Staff", "Country Code"], None),
+    ("Best-selling German stores", ["Total Sales", "Store Type", "Country Code"], ".2f"),
+    ("Yearly averages of sale speed", ["Year", "Actual Time Taken"], None),
+]
+
+
+class Pipeline():
+    """Class tying together the extraction, cleaning and
+    database utilities to run the MRDC ETL. Each stage method
+    pulls one dataset from its remote source, cleans it and
+    uploads it to the local database given in creds_filepath.
+    Nothing is extracted or uploaded until a stage is called.
+
+    Rows rejected by each cleaner are uploaded to a
+    dq_rejected_<table> table (replaced every run) and the column
+    profiles to dq_profile (appended to, one set per run_id).
+
+    Primary key uniqueness of every dimension table and foreign key
+    coverage of orders_table are checked in memory before upload.
+    Every violation found so far is loaded to dq_key_violations
+    (replaced after each check) and stops the constraints stage
+    before any constraint query is executed.
+
+    The export stage writes the constrained star schema to Parquet
+    in export_dir. If offline is set, the analytics stage runs the
+    queries against that export with DuckDB instead of the local
+    database.
+
+    If async_extract is set, the sources of all selected stages are
+    extracted concurrently with AsyncDataExtractor before the first
+    stage runs, within a shared budget of max_concurrency requests
+    in flight (and requests_per_second, if given).
+
+    Every upload and the constraints stage bump the version of the
+    tables they change in cache_dir, in a version file kept per local
+    database (LOCAL_HOST, LOCAL_PORT and LOCAL_DATABASE in the
+    credentials file). Unless use_cache is False,
+    analytics results are cached there and an analytics query is
+    only re-executed once one of the tables it reads has changed.
+    Results are keyed on the local database they were read from, so
+    runs with different credentials files never share them. Offline
+    results are keyed on the modification time and size of
+    the exported Parquet files instead.
+
+    run() records the wall time of every stage in stage_timings and
+    upload_table() the number of rows loaded per table in rows_loaded.
+    The number of HTTP retries and failed requests of every stage is
+    recorded in request_counts as a (retries, errors) tuple.
+    """
+
+    STAGES = ["card", "dates", "products", "stores", "users", "orders",
+              "constraints", "export", "analytics"]
+    SOURCE_STAGES = ["card", "dates", "products", "stores", "users", "orders"]
+
+    def __init__(self, creds_filepath="db_credentials.yaml",
+                 export_dir="star_schema_export", offline=False,
+                 async_extract=False, max_concurrency=20, requests_per_second=None,
+                 cache_dir=".mrdc_cache", use_cache=True):
+        self.creds_filepath = creds_filepath
+        self.export_dir = export_dir
+        self.offline = offline
+        self.async_extract = async_extract
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.extracted = {}
+        self.sources = None
+        self.stage_timings = {}
+        self.rows_loaded = {}
+        self.request_counts = {}
+        self.local_database = self.__local_database()
+        database_dir = re.sub(r'[^\w.-]', '_', self.local_database)
+        self.table_versions = TableVersions(os.path.join(cache_dir, database_dir, "table_versions.json"))
+        self.query_cache = QueryCache(os.path.join(cache_dir, "results"), self.table_versions) \
+            if use_cache else None
+        self.connector = DatabaseConnector(table_versions=self.table_versions)
+        self.extractor = DataExtractor()
+        self.quality = DataQuality()
+        self.cleaner = DataCleaning(quality=self.quality)
+        self.keys = KeyIntegrity()
+
+    def __local_database(self):
+        """Helper method, returns "<host>:<port>/<database>" of the
+        local database in the credentials file, which identifies its
+        table versions and cached results. Returns "unknown" if the
+        credentials file does not exist."""
+        if not os.path.exists(self.creds_filepath):
+            return "unknown"
+        creds = DatabaseConnector().read_db_creds(self.creds_filepath) or {}
+
+        return f"{creds.get('LOCAL_HOST')}:{creds.get('LOCAL_PORT')}/{creds.get('LOCAL_DATABASE')}"
+
+    def source(self, key):
+        """Returns a source endpoint or URI setting: the value of
+        key in the credentials file if present, otherwise its value
+        in DEFAULT_SOURCES. Raises a ValueError if a key in
+        REQUIRED_SOURCES is missing from the credentials file."""
+        if self.sources is None:
+            creds = self.connector.read_db_creds(self.creds_filepath) or {}
+            self.sources = {name: creds.get(name, default) for name, default in DEFAULT_SOURCES.items()}
+            self.sources.update({name: creds[name] for name in REQUIRED_SOURCES if creds.get(name)})
+        if key in REQUIRED_SOURCES and key not in self.sources:
+            raise ValueError(f"{key} is missing, add it to the credentials file {self.creds_filepath}")
+
+        return self.sources[key]
+
+    def extract(self, source):
+        """Returns the raw dataframe of a source stage, taken from
+        the prefetched results if prefetch_sources() extracted it,
+        otherwise extracted synchronously with DataExtractor."""
+        if source in self.extracted:
+            return self.extracted.pop(source)
+
+        if source == "card":
+            return self.extractor.retrieve_pdf_data(self.source("CARD_PDF_URL"))
+        elif source == "dates":
+            return self.extractor.extract_json(self.source("DATE_EVENTS_URL"))
+        elif source == "products":
+            return self.extractor.extract_from_s3(uri=self.source("PRODUCTS_S3_URI"),
+                                                  endpoint_url=self.source("S3_ENDPOINT_URL"))
+        elif source == "stores":
+            header = {'x-api-key': self.source("STORES_API_KEY")}
+            num_stores = self.extractor.list_number_of_stores(endpoint=self.source("NUM_OF_STORES_ENDPOINT"),
+                                                              header_dict=header)
+            return self.extractor.retrieve_stores_data(num_stores=num_stores, endpoint=self.source("STORE_ENDPOINT"),
+                                                       header_dict=header)
+        elif source == "users":
+            return self.extractor.read_rds_table(self.connector, "legacy_users", self.creds_filepath)
+        elif source == "orders":
+            return self.extractor.read_rds_table(self.connector, "orders_table", self.creds_filepath)
+
+    async def extract_async(self, sources):
+        """Extracts the given sources concurrently on one event
+        loop. The RDS tables are read through one shared engine,
+        which is disposed of afterwards. Returns a dict of raw
+        dataframes keyed by source."""
+        engine = None
+        if "users" in sources or "orders" in sources:
+            engine = self.connector.init_db_engine(self.creds_filepath)
+
+        try:
+            async with AsyncDataExtractor(max_concurrency=self.max_concurrency,
+                                          requests_per_second=self.requests_per_second,
+                                          s3_endpoint_url=self.source("S3_ENDPOINT_URL")) as extractor:
+
+                async def stores():
+                    header = {'x-api-key': self.source("STORES_API_KEY")}
+                    num_stores = await extractor.list_number_of_stores(self.source("NUM_OF_STORES_ENDPOINT"), header)
+                    return await extractor.retrieve_stores_data(num_stores, self.source("STORE_ENDPOINT"), header)
+
+                coroutines = {
+                    "card": lambda: extractor.retrieve_pdf_data(self.source("CARD_PDF_URL")),
+                    "dates": lambda: extractor.extract_json(self.source("DATE_EVENTS_URL")),
+                    "products": lambda: extractor.extract_from_s3(self.source("PRODUCTS_S3_URI")),
+                    "stores": stores,
+                    "users": lambda: extractor.read_rds_table(engine, "legacy_users"),
+                    "orders": lambda: extractor.read_rds_table(engine, "orders_table"),
+                }
+                results = await asyncio.gather(*[coroutines[source]() for source in sources])
+                self.request_counts["prefetch"] = (extractor.request_retries, extractor.request_errors)
+        finally:
+            if engine is not None:
+                engine.dispose()
+
+        return dict(zip(sources, results))
+
+    def prefetch_sources(self, stages):
+        """Runs extract_async() for the source stages in stages
+        and keeps the results for the stage methods to use."""
+        sources = [source for source in self.SOURCE_STAGES if source in stages]
+        if sources:
+            self.extracted.update(asyncio.run(self.extract_async(sources)))
+
+    def upload_table(self, df, table_name):
+        """Prints a summary of a clean dataframe, checks its
+        primary key if it is a dimension table and uploads it,
+        followed by any data quality results recorded for it."""
+        df.info()
+        self.rows_loaded[table_name] = len(df)
+        if table_name in PRIMARY_KEYS:
+            self.keys.check_primary_key(table_name, df)
+            self.upload_key_violations()
+        self.connector.upload_to_db(df, table_name, self.creds_filepath)
+        if table_name in self.quality.rejected:
+            self.upload_quality(table_name)
+
+    def upload_quality(self, table_name):
+        """Bulk loads the quarantined rows and column profile
+        recorded for table_name to the dq_* tables."""
+        self.connector.upload_to_db(self.quality.quarantine_frame(table_name),
+                                    f"dq_rejected_{table_name}", self.creds_filepath)
+        self.connector.upload_to_db(self.quality.profile_frame(table_name),
+                                    "dq_profile", self.creds_filepath, if_exists='append')
+
+    def upload_key_violations(self):
+        """Loads every key violation recorded so far to
+        dq_key_violations, replacing the previous results."""
+        self.connector.upload_to_db(self.keys.violations_frame(), "dq_key_violations",
+                                    self.creds_filepath)
+
+    def clean_upload_card_table(self):
+        card_df = self.extract("card")
+        card_df = self.cleaner.clean_card_data(card_df)
+        self.upload_table(card_df, "dim_card_details")
+
+    def upload_clean_date_times(self):
+        events = self.extract("dates")
+        events_clean = self.cleaner.clean_date_events(events)
+        self.upload_table(events_clean, "dim_date_times")
+
+    def upload_clean_products_table(self):
+        product_df = self.extract("products")
+        product_df = self.cleaner.clean_products_data(product_df)
+        self.upload_table(product_df, "dim_products")
+
+    def upload_clean_stores_table(self):
+        stores_df = self.extract("stores")
+        stores_df = self.cleaner.clean_store_data(stores_df)
+        self.upload_table(stores_df, "dim_store_details")
+
+    def upload_clean_users_table(self):
+        users = self.extract("users")
+        users_clean = self.cleaner.clean_user_data(users)
+        self.upload_table(users_clean, "dim_users")
+
+    def upload_clean_orders_table(self):
+        """Reads the orders table from remote, checks its foreign
+        keys against the dimension tables loaded so far and uploads
+        it along with any key violations found."""
+        orders = self.extract("orders")
+        orders_clean = self.cleaner.clean_orders_table(orders)
+        self.keys.check_foreign_keys(orders_clean, "orders_table")
+        self.upload_key_violations()
+        self.upload_table(orders_clean, "orders_table")
+
+    def apply_constraints(self, sql_filepath=CONSTRAINT_QUERIES_PATH):
+        """Execute SQL data type casting, primary key generation
+        and foreign key constraints on the local database. Raises
+        a ValueError without executing anything if key violations
+        were found while loading the tables."""
+        violations = self.keys.violations_frame()
+        if len(violations):
+            summary = violations.groupby(["table_name", "column_name", "violation"])["row_count"].sum()
+            raise ValueError(f"Key violations found, see dq_key_violations:\n{summary}")
+
+        engine = self.connector.connect_to_local_db(self.creds_filepath)
+        statements = self.connector.read_sql_file(sql_filepath)
+        self.connector.execute_sql_statements(engine, statements, pull_response=False)
+        self.table_versions.bump(*{table for statement in statements
+                                   for table in referenced_tables(statement)})
+
+    def export_star_schema(self):
+        """Writes orders_table and the dim_* tables from the local
+        database to Parquet files in export_dir."""
+        engine = self.connector.connect_to_local_db(self.creds_filepath)
+        row_counts = ColumnarExport(self.export_dir).export_star_schema(engine)
+        for table_name, row_count in row_counts.items():
+            print(f"Exported {row_count} rows of {table_name} to {self.export_dir}")
+
+    def analytics_queries(self, sql_filepath=ANALYTICS_QUERIES_PATH):
+        """Executes the analytics queries against the local
+        database, or the Parquet export if offline is set, and
+        prints each response as a table under its report title."""
+        from tabulate import tabulate
+
+        statements = self.connector.read_sql_file(sql_filepath)
+        backend = f"duckdb:{os.path.abspath(self.export_dir)}" if self.offline \
+            else f"postgres:{self.local_database}"
+        # Offline results depend on the exported files, not on the local database tables
+        versions = ColumnarExport(self.export_dir).file_versions() if self.offline else None
+
+        responses = [None] * len(statements)
+        if self.query_cache is not None:
+            responses = [self.query_cache.get(statement, backend, versions) for statement in statements]
+        stale = [i for i, response in enumerate(responses) if response is None]
+
+        if stale:
+            stale_statements = [statements[i] for i in stale]
+            if self.offline:
+                fresh = ColumnarExport(self.export_dir).execute_sql_statements(stale_statements)
+            else:
+                engine = self.connector.connect_to_local_db(self.creds_filepath)
+                fresh = self.connector.execute_sql_statements(engine, stale_statements, pull_response=True)
+            for i, response in zip(stale, fresh):
+                responses[i] = response
+                if self.query_cache is not None:
+                    self.query_cache.put(statements[i], backend, response, versions)
+        print(f"{len(statements) - len(stale)} of {len(statements)} reports served from cache.")
+
+        for (title, header, floatfmt), response in zip(ANALYTICS_REPORTS, responses):
+            options = {"floatfmt": floatfmt} if floatfmt else {}
+            print(f"\n{title}")
+            print(tabulate(response, headers=header, tablefmt="simple_outline",
+                           numalign="center", stralign='center', **options))
+
+    def run(self, stages=None):
+        """Runs the given stages (all of them by default) in
+        the order defined in STAGES."""
+        stage_methods = {
+            "card": self.clean_upload_card_table,
+            "dates": self.upload_clean_date_times,
+            "products": self.upload_clean_products_table,
+            "stores": self.upload_clean_stores_table,
+            "users": self.upload_clean_users_table,
+            "orders": self.upload_clean_orders_table,
+            "constraints": self.apply_constraints,
+            "export": self.export_star_schema,
+            "analytics": self.analytics_queries,
+        }
+        stages = stages or self.STAGES
+        if self.async_extract:
+            start = time.perf_counter()
+            self.prefetch_sources(stages)
+            self.stage_timings["prefetch"] = time.perf_counter() - start
+        for stage in self.STAGES:
+            if stage in stages:
+                start = time.perf_counter()
+                retries, errors = self.extractor.request_retries, self.extractor.request_errors
+                stage_methods[stage]()
+                self.stage_timings[stage] = time.perf_counter() - start
+                self.request_counts[stage] = (self.extractor.request_retries - retries,
+                                              self.extractor.request_errors - errors)
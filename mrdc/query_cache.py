@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+
+
+_COMMENT_REGEX = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_TABLE_REGEX = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO|ALTER\s+TABLE)\s+"?([A-Za-z_]\w*)\b(?!\s*\()',
+                          re.IGNORECASE) # not followed by "(", as in EXTRACT(x FROM AVG(...))
+_CTE_REGEX = re.compile(r'\b([A-Za-z_]\w*)\s+AS\s*\(', re.IGNORECASE)
+
+
+def normalize_sql(statement):
+    """Strips comments from an SQL statement and collapses all
+    whitespace, so that formatting changes do not change its
+    cache key. Return: normalized statement."""
+    statement = _COMMENT_REGEX.sub(' ', statement)
+
+    return ' '.join(statement.split())
+
+
+def referenced_tables(statement):
+    """Returns the sorted names of the tables an SQL statement
+    reads from or writes to, excluding the CTEs it defines."""
+    statement = _COMMENT_REGEX.sub(' ', statement)
+    ctes = {name.lower() for name in _CTE_REGEX.findall(statement)}
+
+    return sorted({name for name in _TABLE_REGEX.findall(statement) if name.lower() not in ctes})
+
+
+class TableVersions():
+    """Class keeping a version stamp for every table in the local
+    database, persisted as JSON in versions_filepath. A table's
+    stamp is replaced whenever it is (re)loaded or altered, which
+    invalidates every cached query result that depends on it.
+    Tables that have never been bumped have the version None.
+    """
+
+    def __init__(self, versions_filepath):
+        self.versions_filepath = versions_filepath
+
+    def read_versions(self):
+        """Returns the dict of table name to version stamp."""
+        if not os.path.exists(self.versions_filepath):
+            return {}
+        with open(self.versions_filepath, "r") as file:
+            return json.load(file)
+
+    def bump(self, *table_names):
+        """Gives each of table_names a new version stamp."""
+        versions = self.read_versions()
+        stamp = str(time.time_ns())
+        for table_name in table_names:
+            versions[table_name] = stamp
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.versions_filepath)), exist_ok=True)
+        tmp_filepath = f"{self.versions_filepath}.tmp"
+        with open(tmp_filepath, "w") as file:
+            json.dump(versions, file, indent=2, sort_keys=True)
+        os.replace(tmp_filepath, self.versions_filepath)
+
+
+class QueryCache():
+    """Class caching query results on local disk. Results are keyed
+    on the normalized SQL text, the backend they were computed on and
+    the current version stamp of every table the query references, so
+    a result is recomputed only after one of its tables has changed.
+
+    Each result is pickled to its own file in cache_dir. When the
+    files exceed max_bytes in total, the least recently used results
+    are evicted first.
+
+    get() and put() take an optional versions dict to key on instead
+    of table_versions, for backends whose tables are not versioned by
+    uploads (e.g. the Parquet files of a ColumnarExport).
+    """
+
+    def __init__(self, cache_dir, table_versions, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.table_versions = table_versions
+        self.max_bytes = max_bytes
+
+    def __key(self, statement, backend, versions=None):
+        if versions is None:
+            versions = self.table_versions.read_versions()
+        table_stamps = {table: versions.get(table) for table in referenced_tables(statement)}
+        key_source = json.dumps([backend, normalize_sql(statement), table_stamps], sort_keys=True)
+
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def __path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, statement, backend, versions=None):
+        """Returns the cached result of statement on backend, or
+        None if there is no result for the current table versions."""
+        path = self.__path(self.__key(statement, backend, versions))
+        try:
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path) # mark as recently used
+
+        return result
+
+    def put(self, statement, backend, result, versions=None):
+        """Stores the result of statement on backend for the
+        current table versions, then evicts old results if the
+        cache is over max_bytes."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.__path(self.__key(statement, backend, versions))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Deletes the least recently used results until the
+        cache is no larger than max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
@@ -46,16 +46,7 @@ FOREIGN KEY (store_code) REFERENCES dim_store_details (store_code);
 UPDATE dim_products
 SET product_price = REPLACE(product_price, '£', '')
 WHERE product_price LIKE '£%';
-ALTER TABLE dim_products ADD COLUMN weight_class VARCHAR(14);
-UPDATE dim_products
-SET weight_class = 
-    CASE 
-        WHEN weight < 2 THEN 'Light'
-        WHEN weight >= 2 AND weight < 40 THEN 'Mid_Sized'
-        WHEN weight >= 40 AND weight < 140 THEN 'Heavy'
-        WHEN weight >= 140 THEN 'Truck_Required'
-        ELSE NULL
-    END;
+-- weight_class is assigned by DataCleaning when the weights are converted
 ALTER TABLE dim_products RENAME COLUMN removed to still_available;
 ALTER TABLE dim_products ALTER COLUMN product_price TYPE FLOAT USING product_price::double precision,
 ALTER COLUMN weight TYPE FLOAT,
@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+
+
+DATE_UUIDS = [
+    "2bd0b8e5-a6ab-4e6f-8bde-36ebf09e2dfb",
+    "6c7cb3a4-ed2e-4fb6-9e5e-a3f4b5fa25c1",
+    "cb3c1a75-1c07-4a33-ae1b-b39b6b3f4bd4",
+]
+
+
+@pytest.fixture
+def date_events():
+    """Returns a function building a raw date events dataframe from
+    rows of [timestamp, month, year, day, time_period, n], where n
+    picks one of the valid DATE_UUIDS as the row's date_uuid."""
+    def build(rows):
+        rows = [row[:-1] + [DATE_UUIDS[row[-1]]] for row in rows]
+        return pd.DataFrame(rows, columns=["timestamp", "month", "year", "day", "time_period", "date_uuid"])
+
+    return build
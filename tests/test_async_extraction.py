@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+from mrdc.async_extraction import AsyncDataExtractor
+from mrdc.load_test import StubAPIServer
+
+pytest.importorskip("aiohttp")
+
+
+API_KEY = "test-key"
+HEADER = {"x-api-key": API_KEY}
+
+
+@pytest.fixture
+def stub_api(request):
+    latency, error_rate = getattr(request, "param", (0.0, 0.0))
+    stores = [{"store_code": f"ST-{i:08d}", "staff_numbers": str(i)} for i in range(50)]
+    server = StubAPIServer({}, stores, API_KEY, latency=latency, error_rate=error_rate, seed=1)
+    base_url = server.start()
+    yield server, f"{base_url}/prod/number_stores", f"{base_url}/prod/store_details/"
+    server.stop()
+
+
+def retrieve_stores(extractor, number_endpoint, store_endpoint, header=HEADER):
+    async def run():
+        async with extractor:
+            num_stores = await extractor.list_number_of_stores(number_endpoint, header)
+            return await extractor.retrieve_stores_data(num_stores, store_endpoint, header)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("stub_api", [(0.01, 0.2)], indirect=True)
+def test_retries_server_errors(stub_api):
+    _, number_endpoint, store_endpoint = stub_api
+    extractor = AsyncDataExtractor(max_concurrency=10, max_retries=5, backoff=0.01)
+    stores = retrieve_stores(extractor, number_endpoint, store_endpoint)
+
+    assert stores["store_code"].tolist() == [f"ST-{i:08d}" for i in range(50)]
+    assert extractor.request_retries > 0
+    assert extractor.request_errors == 0
+
+
+@pytest.mark.parametrize("stub_api", [(0.0, 1.0)], indirect=True)
+def test_gives_up_after_max_retries(stub_api):
+    _, number_endpoint, store_endpoint = stub_api
+    extractor = AsyncDataExtractor(max_retries=2, backoff=0.01)
+
+    with pytest.raises(ValueError, match="Number of stores is unknown"):
+        retrieve_stores(extractor, number_endpoint, store_endpoint)
+    assert extractor.request_retries == 2
+    assert extractor.request_errors == 1
+
+
+def test_client_errors_are_not_retried(stub_api):
+    _, number_endpoint, store_endpoint = stub_api
+    extractor = AsyncDataExtractor(max_retries=3, backoff=0.01)
+
+    with pytest.raises(ValueError):
+        retrieve_stores(extractor, number_endpoint, store_endpoint, header={"x-api-key": "wrong"})
+    assert extractor.request_retries == 0
+    assert extractor.request_errors == 1
+
+
+@pytest.mark.parametrize("stub_api", [(0.05, 0.0)], indirect=True)
+def test_max_concurrency(stub_api):
+    _, number_endpoint, store_endpoint = stub_api
+    extractor = AsyncDataExtractor(max_concurrency=10)
+    start = time.perf_counter()
+    retrieve_stores(extractor, number_endpoint, store_endpoint)
+
+    # 1 + 50 requests of 0.05s each, at most 10 in flight at a time
+    assert time.perf_counter() - start >= 6 * 0.05
+
+
+def test_requests_per_second(stub_api):
+    _, number_endpoint, store_endpoint = stub_api
+    extractor = AsyncDataExtractor(max_concurrency=50, requests_per_second=100)
+    start = time.perf_counter()
+    retrieve_stores(extractor, number_endpoint, store_endpoint)
+
+    # 51 requests, started 1/100s apart
+    assert time.perf_counter() - start >= 50 / 100
+
+
+def test_read_rds_table_propagates_errors(tmp_path):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'remote.db'}")
+
+    async def run():
+        async with AsyncDataExtractor() as extractor:
+            return await extractor.read_rds_table(engine, "legacy_users")
+
+    with pytest.raises(ValueError, match="legacy_users"):
+        asyncio.run(run())
+    engine.dispose()
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from mrdc.columnar_export import ColumnarExport, ORDERS_TABLE
+from mrdc.pipeline import ANALYTICS_QUERIES_PATH
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+
+DATES = [
+    # date_uuid, year, month, day, timestamp
+    ("d1", "2020", "1", "31", "10:00:00"),
+    ("d2", "2020", "2", "1", "13:00:00"), # 1 day 3 hours after d1
+    ("d3", "2021", "3", "5", "09:00:00"),
+    ("d4", "2021", "3", "5", "09:00:01"),
+    ("d5", "2021", "3", "5", "09:00:02"),
+    ("d6", "2021", "3", "5", "09:00:04"),
+]
+
+
+@pytest.fixture
+def export(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'star.db'}")
+    tables = {
+        "dim_users": pd.DataFrame({"user_uuid": ["u1"]}),
+        "dim_card_details": pd.DataFrame({"card_number": ["4111"]}),
+        "dim_store_details": pd.DataFrame({
+            "store_code": ["S1", "WEB"], "store_type": ["Local", "Web Portal"],
+            "country_code": ["GB", "DE"], "locality": ["London", "Berlin"], "staff_numbers": [10, 5],
+        }),
+        "dim_products": pd.DataFrame({"product_code": ["p1", "p2"], "product_price": [1.2345, 2.0]}),
+        "dim_date_times": pd.DataFrame(DATES, columns=["date_uuid", "year", "month", "day", "timestamp"]),
+        ORDERS_TABLE: pd.DataFrame({
+            "date_uuid": ["d1", "d2", "d3", "d4", "d5", "d6"],
+            "user_uuid": "u1",
+            "card_number": "4111",
+            "store_code": ["S1", "S1", "WEB", "WEB", "WEB", "WEB"],
+            "product_code": ["p1", "p2", "p2", "p2", "p2", "p2"],
+            "product_quantity": [1, 1, 1, 1, 1, 1],
+        }),
+    }
+    for table_name, df in tables.items():
+        df.to_sql(table_name, engine, index=False)
+
+    export = ColumnarExport(str(tmp_path / "export"))
+    row_counts = export.export_star_schema(engine)
+    engine.dispose()
+    assert row_counts == {table_name: len(df) for table_name, df in tables.items()}
+
+    return export
+
+
+def test_orders_partitioned_by_year_and_month(export):
+    orders_path = os.path.join(export.export_dir, ORDERS_TABLE)
+    partitions = sorted(os.path.relpath(root, orders_path) for root, _, files in os.walk(orders_path) if files)
+
+    assert partitions == [os.path.join("year=2020", "month=1"), os.path.join("year=2020", "month=2"),
+                          os.path.join("year=2021", "month=3")]
+
+
+def test_orders_view_matches_original_table(export):
+    con = export.connect_duckdb()
+    try:
+        columns = [row[0] for row in con.execute(f"DESCRIBE {ORDERS_TABLE}").fetchall()]
+        row_count = con.execute(f"SELECT COUNT(*) FROM {ORDERS_TABLE}").fetchone()[0]
+    finally:
+        con.close()
+
+    assert columns == ["date_uuid", "user_uuid", "card_number", "store_code", "product_code", "product_quantity"]
+    assert row_count == 6
+
+
+def test_analytics_offline(export):
+    responses = export.execute_sql_file(ANALYTICS_QUERIES_PATH)
+
+    assert len(responses) == 9
+    # 3. ROUND(1.2345::numeric, 2) is 1.23 in Postgres, not 1.24
+    monthly_sales = {month: float(total) for total, month in responses[2]}
+    assert monthly_sales == {"1": 1.23, "2": 2.0, "3": 8.0}
+
+    # 9. Average time between sales, whole days are kept out of the hours
+    yearly = {year: json.loads(speed) for year, speed in responses[8]}
+    assert yearly["2020"]["hours"] == 3
+    assert yearly["2021"]["seconds"] == pytest.approx(1.333333)
+    assert yearly["2021"]["milliseconds"] == pytest.approx(1333.333)
@@ -0,0 +1,89 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from mrdc.data_cleaning import DataCleaning
+from mrdc.data_quality import DataQuality
+
+
+def test_cleaner_drops_exact_duplicates(date_events):
+    quality = DataQuality()
+    raw = date_events([
+        ["10:00:00", "1", "2020", "1", "Morning", 0],
+        ["10:00:00", "1", "2020", "1", "Morning", 0],
+        ["11:00:00", "1", "2020", "1", "Morning", 1],
+    ])
+    clean = DataCleaning(quality=quality).clean_date_events(raw.copy())
+
+    assert clean.index.tolist() == [0, 2]
+    assert quality.quarantine_frame("dim_date_times")["reject_reason"].to_dict() == {1: "duplicate"}
+
+
+def test_cleaner_keeps_reasons_of_rows_collapsed_by_cleaning(date_events):
+    # Rows that only differ in entries the cleaner invalidates are
+    # duplicates once cleaned, but are quarantined for their own
+    # invalid entries rather than as duplicates.
+    quality = DataQuality()
+    raw = date_events([
+        ["25:00:00", "1", "2020", "1", "Morning", 0],
+        ["bad", "1", "2020", "1", "Morning", 0],
+        ["junk", "1", "2020", "1", "Morning", 0],
+    ])
+    clean = DataCleaning(quality=quality).clean_date_events(raw.copy())
+
+    assert clean.empty
+    reasons = quality.quarantine_frame("dim_date_times")["reject_reason"].to_dict()
+    assert reasons == {0: "timestamp:invalid", 1: "timestamp:invalid", 2: "timestamp:invalid"}
+    profile = quality.profile_frame("dim_date_times").set_index("column_name")
+    assert profile.loc["timestamp", "reject_count"] == 3
+
+
+def clean_products(weights, weight_units=None):
+    """Cleans one otherwise valid product per weight. Returns the
+    clean products and the quarantined ones."""
+    n = len(weights)
+    raw = pd.DataFrame({
+        "Unnamed: 0": range(n),
+        "product_name": [f"Product {i}" for i in range(n)],
+        "product_price": "£1.00",
+        "weight": weights,
+        "category": "diy",
+        "EAN": "1234567890123",
+        "date_added": "2020-01-01",
+        "uuid": [str(uuid.UUID(int=i)) for i in range(n)],
+        "removed": "Still_available",
+        "product_code": [f"A1-{i}" for i in range(n)],
+    })
+    quality = DataQuality()
+    clean = DataCleaning(quality=quality, weight_units=weight_units).clean_products_data(raw)
+
+    return clean, quality.quarantine_frame("dim_products")
+
+
+def test_weight_parsing():
+    df, _ = clean_products(["1kg", "500g", "12 x 100g", "3x2kg", "16oz", "330ml", "77g .", " 2.5 KG"])
+
+    expected = [1.0, 0.5, 1.2, 6.0, 16 * 0.0283495, 0.33, 0.077, 2.5]
+    assert np.allclose(df["weight"].to_numpy(), expected)
+
+
+def test_weight_parsing_invalid_entries():
+    df, rejected = clean_products(["2lb", "heavy", None, "kg", "NULL", "1kg"])
+
+    assert df.index.tolist() == [5]
+    assert rejected["reject_reason"].tolist() == ["weight:invalid", "weight:invalid", "weight:missing",
+                                                 "weight:invalid", "weight:missing"]
+
+
+def test_weight_units_override():
+    df, _ = clean_products(["2lb", "1kg", "3 LB"], weight_units={"LB": 0.453592})
+
+    assert np.allclose(df["weight"].to_numpy(), [0.907184, 1.0, 1.360776])
+
+
+def test_weight_class_bins():
+    df, _ = clean_products(["1.999kg", "2kg", "39.9kg", "40kg", "139kg", "140kg", "0g"])
+
+    assert df["weight_class"].tolist() == ["Light", "Mid_Sized", "Mid_Sized", "Heavy",
+                                           "Heavy", "Truck_Required", "Light"]
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from mrdc.data_cleaning import DataCleaning
+from mrdc.data_quality import DataQuality
+
+
+def test_record_reason_codes():
+    raw = pd.DataFrame({"a": ["1", "x", "NULL", "1"], "b": ["u", "v", "w", "u"]})
+    validated = raw.replace({"x": np.nan, "NULL": np.nan})
+    clean = validated.drop_duplicates().dropna()
+
+    quality = DataQuality(run_id="run")
+    quality.record("t", raw, validated, clean)
+    quarantine = quality.quarantine_frame("t")
+
+    assert quarantine["reject_reason"].to_dict() == {1: "a:invalid", 2: "a:missing", 3: "duplicate"}
+    assert (quarantine["run_id"] == "run").all()
+    assert quarantine["a"].tolist() == ["x", "NULL", "1"] # raw values are kept
+
+
+def test_record_multiple_reasons_per_row():
+    raw = pd.DataFrame({"a": ["x", "1"], "b": [None, "v"]})
+    validated = pd.DataFrame({"a": [np.nan, "1"], "b": [np.nan, "v"]})
+    clean = validated.dropna()
+
+    quality = DataQuality()
+    quality.record("t", raw, validated, clean)
+
+    assert quality.quarantine_frame("t")["reject_reason"].tolist() == ["a:invalid;b:missing"]
+
+
+def test_record_cleaned_duplicates():
+    # Rows that are only duplicates once cleaned are not raw duplicates
+    raw = pd.DataFrame({"a": ["x ", "x", "y", "y"]})
+    validated = raw.apply(lambda col: col.str.strip())
+    clean = validated.drop_duplicates().dropna()
+
+    quality = DataQuality()
+    quality.record("t", raw, validated, clean)
+
+    assert quality.quarantine_frame("t")["reject_reason"].to_dict() == {1: "cleaned_duplicate", 3: "duplicate"}
+
+
+def test_profile():
+    raw = pd.DataFrame({"a": ["1", "x", "NULL", "1"], "b": ["u", "v", "w", "u"]})
+    validated = raw.replace({"x": np.nan, "NULL": np.nan})
+    clean = validated.drop_duplicates().dropna()
+
+    quality = DataQuality(run_id="run")
+    quality.record("t", raw, validated, clean)
+    profile = quality.profile_frame("t").set_index("column_name")
+
+    assert profile.loc["a", "rows_in"] == 4
+    assert profile.loc["a", "rows_out"] == 1
+    assert profile.loc["a", "reject_count"] == 1
+    assert profile.loc["b", "reject_count"] == 0
+    assert profile.loc["a", "null_rate"] == 2 / 4
+    assert profile.loc["b", "distinct_count"] == 3
+
+
+def test_profile_frame_concatenates_tables():
+    df = pd.DataFrame({"a": ["1"]})
+    quality = DataQuality()
+    quality.record("t1", df, df, df)
+    quality.record("t2", df, df, df)
+
+    assert quality.profile_frame()["table_name"].tolist() == ["t1", "t2"]
+
+
+def test_cleaner_records_quality(date_events):
+    quality = DataQuality()
+    raw = date_events([
+        ["10:00:00", "1", "2020", "1", "Morning", 0],
+        ["25:00:00", "1", "2020", "1", "Morning", 1],
+        ["10:00:00", "NULL", "2020", "1", "Morning", 2],
+    ])
+    clean = DataCleaning(quality=quality).clean_date_events(raw.copy())
+
+    assert clean.index.tolist() == [0]
+    reasons = quality.quarantine_frame("dim_date_times")["reject_reason"].to_dict()
+    assert reasons == {1: "timestamp:invalid", 2: "month:missing"}
+    assert quality.quarantine_frame("dim_date_times").loc[1, "timestamp"] == "25:00:00"
+
+
+def test_cleaner_without_quality(date_events):
+    raw = date_events([["10:00:00", "1", "2020", "1", "Morning", 0]])
+    clean = DataCleaning().clean_date_events(raw)
+
+    assert len(clean) == 1
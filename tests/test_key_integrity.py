@@ -0,0 +1,62 @@
+import pandas as pd
+
+from mrdc.key_integrity import KeyIntegrity, VIOLATION_COLUMNS
+
+
+def test_primary_key_duplicates_and_nulls():
+    keys = KeyIntegrity()
+    df = pd.DataFrame({"store_code": ["A", "B", "B", None, "C", "C", "C"]})
+    report = keys.check_primary_key("dim_store_details", df)
+
+    duplicates = report[report["violation"] == "duplicate_pk"].set_index("key")["row_count"].to_dict()
+    assert duplicates == {"B": 2, "C": 3}
+    nulls = report[report["violation"] == "null_pk"]
+    assert nulls["row_count"].tolist() == [1]
+    assert list(report.columns) == VIOLATION_COLUMNS
+
+
+def test_primary_key_clean_table():
+    keys = KeyIntegrity()
+    report = keys.check_primary_key("dim_users", pd.DataFrame({"user_uuid": ["a", "b"]}))
+
+    assert report.empty
+    assert keys.violations_frame().empty
+    assert list(keys.violations_frame().columns) == VIOLATION_COLUMNS
+
+
+def test_foreign_key_orphans():
+    keys = KeyIntegrity()
+    keys.check_primary_key("dim_store_details", pd.DataFrame({"store_code": ["A", "B"]}))
+    orders = pd.DataFrame({"store_code": ["A", "X", "X", "B", None]})
+    report = keys.check_foreign_keys(orders)
+
+    assert report["key"].tolist() == ["X"]
+    assert report["row_count"].tolist() == [2]
+    assert report["violation"].tolist() == ["orphan_fk:dim_store_details"]
+    assert report["table_name"].tolist() == ["orders_table"]
+
+
+def test_foreign_keys_compared_as_strings():
+    keys = KeyIntegrity()
+    keys.check_primary_key("dim_card_details", pd.DataFrame({"card_number": ["4111", "5500"]}))
+    report = keys.check_foreign_keys(pd.DataFrame({"card_number": [4111, 5500]}))
+
+    assert report.empty
+
+
+def test_foreign_keys_skip_unchecked_dimensions():
+    keys = KeyIntegrity()
+    report = keys.check_foreign_keys(pd.DataFrame({"user_uuid": ["a"], "product_code": ["p"]}))
+
+    assert report.empty
+    assert list(report.columns) == VIOLATION_COLUMNS
+
+
+def test_violations_frame_collects_every_check():
+    keys = KeyIntegrity()
+    keys.check_primary_key("dim_products", pd.DataFrame({"product_code": ["p", "p"]}))
+    keys.check_foreign_keys(pd.DataFrame({"product_code": ["p", "q"]}))
+
+    violations = keys.violations_frame()
+    assert violations["violation"].tolist() == ["duplicate_pk", "orphan_fk:dim_products"]
+
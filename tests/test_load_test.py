@@ -0,0 +1,41 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from mrdc.data_cleaning import DataCleaning
+from mrdc.data_quality import DataQuality
+from mrdc.load_test import SyntheticData
+
+
+@pytest.fixture(scope="module")
+def data():
+    data = SyntheticData(5000, invalid_rate=0.1)
+    data.generate()
+    return data
+
+
+def test_cleaners_on_synthetic_sources(data):
+    # Every source is read back the way its extractor reads it (the
+    # card PDF is skipped), so the cleaners see the same dtypes and
+    # nulls as in the load test.
+    quality = DataQuality()
+    cleaner = DataCleaning(quality=quality)
+    sources = [
+        ("dim_users", data.users, cleaner.clean_user_data),
+        ("dim_card_details", data.cards, cleaner.clean_card_data),
+        ("dim_store_details", pd.DataFrame(data.store_records()), cleaner.clean_store_data),
+        ("dim_products", pd.read_csv(io.BytesIO(data.products_csv())), cleaner.clean_products_data),
+        ("dim_date_times", pd.DataFrame(json.loads(data.date_events_json())), cleaner.clean_date_events),
+    ]
+    for table_name, raw, clean_method in sources:
+        clean = clean_method(raw.copy())
+
+        # Exactly the junk rows appended to the end are rejected
+        rejected = quality.quarantine_frame(table_name)
+        assert len(rejected) > 0, table_name
+        assert sorted(rejected.index) == sorted(raw.index[len(clean):]), table_name
+
+    orders = cleaner.clean_orders_table(data.orders.copy())
+    assert len(orders) == len(data.orders)
@@ -0,0 +1,151 @@
+import os
+
+from mrdc.columnar_export import ColumnarExport, DIM_TABLES, ORDERS_TABLE
+from mrdc.query_cache import QueryCache, TableVersions, normalize_sql, referenced_tables
+
+
+QUERY = """
+-- Store origin
+SELECT country_code, COUNT(*) FROM dim_store_details /* all stores */
+GROUP BY country_code;
+"""
+
+
+def make_cache(tmp_path, max_bytes=64 * 1024 * 1024):
+    versions = TableVersions(os.path.join(tmp_path, "table_versions.json"))
+    return QueryCache(os.path.join(tmp_path, "results"), versions, max_bytes), versions
+
+
+def test_normalize_sql():
+    assert normalize_sql(QUERY) == \
+        "SELECT country_code, COUNT(*) FROM dim_store_details GROUP BY country_code;"
+    assert normalize_sql("SELECT  1\n\tFROM t") == normalize_sql("SELECT 1 FROM t")
+
+
+def test_referenced_tables():
+    statement = """
+    WITH sales AS (SELECT * FROM orders_table o JOIN dim_products p ON o.product_code = p.product_code)
+    SELECT EXTRACT(HOUR FROM AVG(x)) FROM sales -- FROM dim_users
+    """
+    assert referenced_tables(statement) == ["dim_products", "orders_table"]
+    assert referenced_tables('ALTER TABLE "dim_users" ADD PRIMARY KEY (user_uuid)') == ["dim_users"]
+    assert referenced_tables("UPDATE dim_products SET weight_class = NULL") == ["dim_products"]
+
+
+def test_table_versions(tmp_path):
+    versions = TableVersions(os.path.join(tmp_path, "cache", "table_versions.json"))
+    assert versions.read_versions() == {}
+
+    versions.bump("dim_users", "orders_table")
+    first = versions.read_versions()
+    assert set(first) == {"dim_users", "orders_table"}
+
+    versions.bump("dim_users")
+    second = versions.read_versions()
+    assert second["dim_users"] != first["dim_users"]
+    assert second["orders_table"] == first["orders_table"]
+
+
+def test_cache_round_trip(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    assert cache.get(QUERY, "postgres") is None
+
+    cache.put(QUERY, "postgres", [["GB", 265]])
+    assert cache.get(QUERY, "postgres") == [["GB", 265]]
+    assert cache.get(normalize_sql(QUERY), "postgres") == [["GB", 265]] # formatting only
+    assert cache.get(QUERY, "duckdb:/export") is None
+
+
+def test_cache_invalidated_by_referenced_table(tmp_path):
+    cache, versions = make_cache(tmp_path)
+    cache.put(QUERY, "postgres", [["GB", 265]])
+
+    versions.bump("dim_users")
+    assert cache.get(QUERY, "postgres") == [["GB", 265]]
+
+    versions.bump("dim_store_details")
+    assert cache.get(QUERY, "postgres") is None
+
+
+def test_cache_versions_override(tmp_path):
+    cache, versions = make_cache(tmp_path)
+    cache.put(QUERY, "duckdb", [["GB", 265]], versions={"dim_store_details": "a"})
+
+    versions.bump("dim_store_details")
+    assert cache.get(QUERY, "duckdb", versions={"dim_store_details": "a"}) == [["GB", 265]]
+    assert cache.get(QUERY, "duckdb", versions={"dim_store_details": "b"}) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache, _ = make_cache(tmp_path, max_bytes=0)
+    cache.put("SELECT 1 FROM a", "postgres", [[1]])
+    assert cache.get("SELECT 1 FROM a", "postgres") is None
+
+    cache.max_bytes = 10 ** 6
+    cache.put("SELECT 1 FROM a", "postgres", [[1]])
+    cache.put("SELECT 1 FROM b", "postgres", [[1]])
+    paths = sorted(entry.path for entry in os.scandir(cache.cache_dir))
+    os.utime(paths[0], ns=(0, 0))
+    os.utime(paths[1], ns=(10 ** 9, 10 ** 9))
+    cache.max_bytes = os.path.getsize(paths[1])
+    cache.evict()
+
+    assert sorted(entry.path for entry in os.scandir(cache.cache_dir)) == [paths[1]]
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(content)
+
+
+def test_file_versions(tmp_path):
+    export = ColumnarExport(str(tmp_path))
+    assert export.file_versions() == {table: None for table in DIM_TABLES + [ORDERS_TABLE]}
+
+    write(os.path.join(tmp_path, "dim_users.parquet"), "users")
+    write(os.path.join(tmp_path, ORDERS_TABLE, "year=2020", "month=1", "part.parquet"), "orders")
+    first = export.file_versions()
+    assert first["dim_users"] is not None
+    assert first[ORDERS_TABLE].startswith(os.path.join("year=2020", "month=1", "part.parquet"))
+    assert first["dim_products"] is None
+
+    write(os.path.join(tmp_path, "dim_users.parquet"), "users, rewritten")
+    write(os.path.join(tmp_path, ORDERS_TABLE, "year=2021", "month=1", "part.parquet"), "orders")
+    second = export.file_versions()
+    assert second["dim_users"] != first["dim_users"]
+    assert second[ORDERS_TABLE] != first[ORDERS_TABLE]
+
+
+def test_file_versions_invalidate_offline_cache(tmp_path):
+    export = ColumnarExport(os.path.join(tmp_path, "export"))
+    cache, _ = make_cache(tmp_path)
+    path = os.path.join(tmp_path, "export", "dim_store_details.parquet")
+    write(path, "stores")
+    cache.put(QUERY, "duckdb", [["GB", 265]], export.file_versions())
+    assert cache.get(QUERY, "duckdb", export.file_versions()) == [["GB", 265]]
+
+    os.utime(path, ns=(10 ** 9, 10 ** 9)) # same size, new mtime
+    assert cache.get(QUERY, "duckdb", export.file_versions()) is None
+
+
+def write_creds(path, database):
+    write(path, f"LOCAL_HOST: localhost\nLOCAL_PORT: 5432\nLOCAL_DATABASE: {database}\n")
+
+
+def test_pipeline_cache_per_database(tmp_path):
+    from mrdc.pipeline import Pipeline
+
+    cache_dir = os.path.join(tmp_path, "cache")
+    write_creds(os.path.join(tmp_path, "a.yaml"), "sales_a")
+    write_creds(os.path.join(tmp_path, "b.yaml"), "sales_b")
+    pipeline_a = Pipeline(creds_filepath=os.path.join(tmp_path, "a.yaml"), cache_dir=cache_dir)
+    pipeline_b = Pipeline(creds_filepath=os.path.join(tmp_path, "b.yaml"), cache_dir=cache_dir)
+    assert pipeline_a.local_database == "localhost:5432/sales_a"
+    assert pipeline_a.table_versions.versions_filepath != pipeline_b.table_versions.versions_filepath
+
+    pipeline_a.table_versions.bump("dim_store_details")
+    assert "dim_store_details" not in pipeline_b.table_versions.read_versions()
+
+    pipeline_a.query_cache.put(QUERY, f"postgres:{pipeline_a.local_database}", [["GB", 265]])
+    assert pipeline_b.query_cache.get(QUERY, f"postgres:{pipeline_b.local_database}") is None